@@ -139,10 +139,10 @@
 
 
 import streamlit as st
-import json
 import hashlib
 from datetime import datetime
-import os
+from lms.repository import user_category
+from lms.users import user_directory
 
 # Custom CSS for styling
 st.markdown("""
@@ -232,45 +232,28 @@ if 'user_type' not in st.session_state:
 def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()
 
-def load_users():
-    if not os.path.exists('users.json'):
-        with open('users.json', 'w') as f:
-            json.dump({'professors': {}, 'students': {}}, f)
-    with open('users.json', 'r') as f:
-        return json.load(f)
-
-def save_users(users):
-    with open('users.json', 'w') as f:
-        json.dump(users, f)
-
 def register_user(username, password, user_type, email):
-    users = load_users()
-    user_category = 'professors' if user_type == 'Professor' else 'students'
-    
-    if username in users[user_category]:
-        return False, "Username already exists"
-    
-    users[user_category][username] = {
+    record = {
         'password': hash_password(password),
         'email': email,
         'created_at': datetime.now().isoformat(),
         'last_login': None
     }
-    save_users(users)
+    if not user_directory.register(user_category(user_type), username, record):
+        return False, "Username already exists"
     return True, "Registration successful"
 
 def authenticate_user(username, password, user_type):
-    users = load_users()
-    user_category = 'professors' if user_type == 'Professor' else 'students'
+    category = user_category(user_type)
+    user = user_directory.get(category, username)
     
-    if username not in users[user_category]:
+    if user is None:
         return False, "Invalid username"
     
-    if users[user_category][username]['password'] != hash_password(password):
+    if user['password'] != hash_password(password):
         return False, "Invalid password"
     
-    users[user_category][username]['last_login'] = datetime.now().isoformat()
-    save_users(users)
+    user_directory.record_login(category, username)
     return True, "Login successful"
 
 # Handle tab switching
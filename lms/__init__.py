@@ -0,0 +1 @@
+"""Shared storage, grading and analytics helpers used by the Streamlit pages."""
@@ -0,0 +1,296 @@
+"""Columnar Parquet snapshots of submissions and study sessions.
+
+Reports over a semester of data should not walk nested JSON record by record.
+The exporter flattens submissions and study sessions into typed columns and
+writes them as hive-partitioned Parquet datasets under ``analytics/``:
+
+    analytics/submissions.<version>/test_id=<id>/*.parquet
+    analytics/study_sessions.<version>/month=<YYYY-MM>/*.parquet
+
+Each export writes a new version directory, then atomically replaces the
+``<dataset>.current`` pointer file naming it, so readers always see a complete
+snapshot. The previous version is kept for readers still on it; older ones are
+removed.
+
+A background thread refreshes the snapshot every ANALYTICS_EXPORT_INTERVAL
+seconds, and ``python -m lms.analytics`` exports once. :func:`query` reads a
+dataset into a DataFrame, reading only the requested columns and skipping
+partitions the filters rule out. The report helpers aggregate it with pandas.
+"""
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from lms.config import ANALYTICS_DIR, ANALYTICS_EXPORT_INTERVAL
+from lms.repository import get_repository
+from lms.stats import submission_percentage
+from lms.study_sessions import study_sessions
+
+logger = logging.getLogger(__name__)
+
+# Report keys written by pages.selfstudy.ConcentrationDetector.get_report
+CONCENTRATION_LEVELS = ('Deep', 'Moderate', 'Low')
+WORKING_STATUSES = ('Working', 'Not Working')
+
+SUBMISSIONS_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('test_id', pa.string()),
+    ('test_name', pa.string()),
+    ('student', pa.string()),
+    ('submitted_at', pa.timestamp('s')),
+    ('month', pa.string()),
+    ('evaluated', pa.bool_()),
+    ('score', pa.float64()),
+    ('total_marks', pa.float64()),
+    ('percentage', pa.float64()),
+])
+
+
+def _time_column(name):
+    return f"{name.lower().replace(' ', '_')}_time"
+
+
+SESSIONS_SCHEMA = pa.schema(
+    [('username', pa.string()),
+     ('started_at', pa.timestamp('s')),
+     ('month', pa.string()),
+     ('total_time', pa.float64())]
+    + [(_time_column(name), pa.float64()) for name in CONCENTRATION_LEVELS + WORKING_STATUSES]
+)
+
+DATASETS = {
+    'submissions': (SUBMISSIONS_SCHEMA, 'test_id'),
+    'study_sessions': (SESSIONS_SCHEMA, 'month'),
+}
+
+
+def _parse_time(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+    except (TypeError, ValueError):
+        return None
+
+
+def submission_rows(submissions):
+    """Flatten submissions into a column dict matching SUBMISSIONS_SCHEMA"""
+    columns = {name: [] for name in SUBMISSIONS_SCHEMA.names}
+    for sub in submissions:
+        submitted_at = _parse_time(sub.get('date'))
+        evaluated = bool(sub.get('evaluated'))
+        columns['id'].append(sub.get('id'))
+        columns['test_id'].append(sub.get('test_id'))
+        columns['test_name'].append(sub.get('test_name'))
+        columns['student'].append(sub.get('student'))
+        columns['submitted_at'].append(submitted_at)
+        columns['month'].append(submitted_at.strftime('%Y-%m') if submitted_at else None)
+        columns['evaluated'].append(evaluated)
+        columns['score'].append(sub.get('score') if evaluated else None)
+        columns['total_marks'].append(sub.get('total_marks') if evaluated else None)
+        columns['percentage'].append(submission_percentage(sub))
+    return columns
+
+
+def session_rows(sessions):
+    """Flatten (username, session) pairs into a column dict matching SESSIONS_SCHEMA"""
+    columns = {name: [] for name in SESSIONS_SCHEMA.names}
+    for username, session in sessions:
+        started_at = _parse_time(session.get('timestamp'))
+        report = session.get('report') or {}
+        columns['username'].append(username)
+        columns['started_at'].append(started_at)
+        columns['month'].append(started_at.strftime('%Y-%m') if started_at else 'unknown')
+        columns['total_time'].append(report.get('total_time'))
+        for section, names in (('concentration_levels', CONCENTRATION_LEVELS),
+                               ('working_status', WORKING_STATUSES)):
+            durations = report.get(section) or {}
+            for name in names:
+                columns[_time_column(name)].append((durations.get(name) or {}).get('time'))
+    return columns
+
+
+def write_dataset(name, columns, root=None):
+    """Replace one partitioned dataset with the given columns; returns the row count"""
+    schema, partition = DATASETS[name]
+    root = str(root or ANALYTICS_DIR)
+    table = pa.Table.from_pydict(columns, schema=schema)
+    suffix = f"{os.getpid()}.{threading.get_ident()}"
+    version = f"{name}.{time.time_ns()}.{suffix}"
+    os.makedirs(os.path.join(root, version))
+    if table.num_rows:
+        pq.write_to_dataset(table, os.path.join(root, version), partition_cols=[partition])
+
+    pointer = os.path.join(root, f"{name}.current")
+    previous = _read_pointer(pointer)
+    tmp_pointer = f"{pointer}.{suffix}.tmp"
+    with open(tmp_pointer, 'w') as f:
+        f.write(version)
+    os.replace(tmp_pointer, pointer)
+
+    # Keep the previous version for readers that resolved the pointer just
+    # before the swap; anything older (or the pre-versioning layout) can go
+    if previous:
+        oldest_kept = _version_time(name, previous)
+        for entry in os.listdir(root):
+            entry_time = _version_time(name, entry)
+            if entry_time is not None and entry_time < oldest_kept:
+                shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
+    shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    return table.num_rows
+
+
+def _read_pointer(pointer):
+    try:
+        with open(pointer, 'r') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _version_time(name, entry):
+    """Creation time encoded in a version directory name, or None for other entries"""
+    prefix = f"{name}."
+    if not entry.startswith(prefix):
+        return None
+    stamp = entry[len(prefix):].split('.', 1)[0]
+    return int(stamp) if stamp.isdigit() else None
+
+
+def dataset_path(name, root=None):
+    """Directory of the dataset's current snapshot, or None before the first export"""
+    root = str(root or ANALYTICS_DIR)
+    version = _read_pointer(os.path.join(root, f"{name}.current"))
+    if version:
+        return os.path.join(root, version)
+    # Snapshots written before versioned directories
+    legacy = os.path.join(root, name)
+    return legacy if os.path.isdir(legacy) else None
+
+
+def query(name, columns=None, filters=None, root=None):
+    """Read a dataset into a DataFrame
+
+    columns limits which columns are read; filters uses pyarrow's DNF form,
+    e.g. [('month', '>=', '2025-01')], and prunes whole partitions when it
+    names the partition column. Returns an empty frame before the first export.
+    """
+    schema, partition = DATASETS[name]
+    path = dataset_path(name, root)
+    if path is None or not os.listdir(path):
+        table = schema.empty_table()
+        if columns is not None:
+            table = table.select(columns)
+        return table.to_pandas()
+    partitioning = ds.partitioning(pa.schema([schema.field(partition)]), flavor='hive')
+    return pq.read_table(path, columns=columns, filters=filters,
+                         partitioning=partitioning, schema=schema).to_pandas()
+
+
+def test_report(filters=None, root=None):
+    """Per-test submission counts and percentage statistics"""
+    df = query('submissions', ['test_id', 'test_name', 'student', 'percentage'],
+               filters=filters, root=root)
+    if df.empty:
+        return pd.DataFrame(columns=['test_name', 'submissions', 'students', 'graded',
+                                     'mean', 'std', 'median'])
+    report = df.groupby('test_id').agg(
+        test_name=('test_name', 'last'),
+        submissions=('student', 'size'),
+        students=('student', 'nunique'),
+        graded=('percentage', 'count'),
+        mean=('percentage', 'mean'),
+        std=('percentage', 'std'),
+        median=('percentage', 'median'),
+    )
+    return report.sort_values('test_name')
+
+
+def monthly_report(filters=None, root=None):
+    """Submissions and study time per month, for semester-level trends
+
+    filters is applied to both datasets, so it should only name 'month'.
+    """
+    subs = query('submissions', ['month', 'percentage'], filters=filters, root=root)
+    sessions = query('study_sessions', ['month', 'total_time', 'deep_time', 'working_time'],
+                     filters=filters, root=root)
+    by_month = subs.groupby('month').agg(
+        submissions=('percentage', 'size'),
+        mean_score=('percentage', 'mean'),
+    )
+    study = sessions.groupby('month').agg(
+        study_sessions=('total_time', 'size'),
+        study_hours=('total_time', 'sum'),
+        deep_hours=('deep_time', 'sum'),
+        working_hours=('working_time', 'sum'),
+    )
+    study[['study_hours', 'deep_hours', 'working_hours']] /= 3600
+    report = by_month.join(study, how='outer').sort_index()
+    count_columns = ['submissions', 'study_sessions']
+    report[count_columns] = report[count_columns].fillna(0).astype(int)
+    return report
+
+
+class AnalyticsExporter:
+    """Refreshes the Parquet snapshot from the live stores on a timer"""
+
+    def __init__(self, root=None, interval=ANALYTICS_EXPORT_INTERVAL, repository=None):
+        self.root = root or ANALYTICS_DIR
+        self.interval = interval
+        self._repository = repository
+        self._lock = threading.Lock()
+        self._thread = None
+        self.last_export = None
+        self.last_error = None
+
+    @property
+    def repository(self):
+        return self._repository or get_repository()
+
+    def export(self):
+        """Write both datasets now; returns {dataset: rows}"""
+        with self._lock:
+            counts = {
+                'submissions': write_dataset(
+                    'submissions', submission_rows(self.repository.iter_submissions()), self.root),
+                'study_sessions': write_dataset(
+                    'study_sessions', session_rows(study_sessions.iter_all()), self.root),
+            }
+            self.last_export = time.time()
+            self.last_error = None
+            return counts
+
+    def start(self):
+        """Start the periodic export thread if it is not already running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._export_loop, daemon=True,
+                                            name='analytics-exporter')
+            self._thread.start()
+
+    def _export_loop(self):
+        while True:
+            if self.last_export is None or time.time() - self.last_export >= self.interval:
+                try:
+                    self.export()
+                except Exception as e:
+                    # Keep serving the last snapshot; the dashboard shows the error
+                    logger.exception("Analytics export failed")
+                    self.last_error = (time.time(), e)
+            time.sleep(min(self.interval, 60))
+
+
+analytics_exporter = AnalyticsExporter()
+
+
+if __name__ == "__main__":
+    counts = analytics_exporter.export()
+    print(f"Exported {counts['submissions']} submissions and "
+          f"{counts['study_sessions']} study sessions to {analytics_exporter.root}")
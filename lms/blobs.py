@@ -0,0 +1,98 @@
+"""Content-addressed storage for uploaded files.
+
+Files are written once under ``blobs/<first two hex digits>/<sha256>``, and
+records keep only the hash. Uploading the same bytes again reuses the stored
+file. Run ``python -m lms.blobs`` to move PDFs that older notes embedded as
+base64 into the store.
+"""
+import base64
+import hashlib
+import os
+import tempfile
+
+from lms.config import data_path
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStore:
+    def __init__(self, root=None):
+        self.root = root or data_path('blobs')
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def exists(self, key):
+        return os.path.exists(self.path(key))
+
+    def put(self, data):
+        """Store bytes and return their key"""
+        key = hashlib.sha256(data).hexdigest()
+        if not self.exists(key):
+            self._write(key, [data])
+        return key
+
+    def put_file(self, fileobj):
+        """Store a file-like object in chunks and return its key"""
+        digest = hashlib.sha256()
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    tmp.write(chunk)
+            key = digest.hexdigest()
+            if self.exists(key):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(self.path(key)), exist_ok=True)
+                os.replace(tmp_path, self.path(key))
+            return key
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def open(self, key):
+        """Open a stored blob for reading"""
+        return open(self.path(key), 'rb')
+
+    def size(self, key):
+        return os.path.getsize(self.path(key))
+
+    def _write(self, key, chunks):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+
+
+blob_store = BlobStore()
+
+
+def move_note_files_to_blobs(repo=None):
+    """Replace base64 'file' fields in notes with blob references
+
+    Returns the number of notes that were rewritten.
+    """
+    from lms.repository import get_repository
+    repo = repo or get_repository()
+    notes = [dict(note) for note in repo.list_notes()]
+    moved = 0
+    for note in notes:
+        if note.get('file'):
+            data = base64.b64decode(note.pop('file'))
+            note['file_ref'] = blob_store.put(data)
+            note['file_size'] = len(data)
+            moved += 1
+    if moved:
+        repo.replace_notes(notes)
+    return moved
+
+
+if __name__ == "__main__":
+    print(f"Moved {move_note_files_to_blobs()} note files into {blob_store.root}")
@@ -0,0 +1,226 @@
+"""Streaming import of tests and export of the gradebook.
+
+Tests are imported from CSV or JSONL with one question per row:
+
+    test_name, subject, duration, total_marks, type, question, options,
+    correct_answer, marks
+
+A test's rows must be consecutive. Rows are read one at a time and only the
+test being assembled is held in memory. When the next test starts, the
+finished one is checked with validate_test (marks adding up to total_marks,
+options for choice questions) and queued. Queued tests are saved
+IMPORT_BATCH at a time. CSV options are separated by '|'; in JSONL they may
+also be a list. A JSONL line holding a whole test (with a 'questions' list) is
+accepted as well; if it carries an id, re-importing it replaces that test.
+
+The gradebook exporter writes one row per submission straight from
+iter_submissions, so neither side needs the whole file in memory. Run
+``python -m lms.bulk import FILE [USERNAME]`` or
+``python -m lms.bulk export FILE``.
+"""
+import csv
+import io
+import json
+import sys
+import uuid
+from collections import namedtuple
+from datetime import datetime
+
+from lms.parsed_tests import validate_test
+from lms.repository import get_repository
+from lms.stats import submission_percentage
+
+# Tests saved per repository write
+IMPORT_BATCH = 200
+
+# Rejected tests reported in full; the rest are only counted
+MAX_ERRORS = 50
+
+QUESTION_COLUMNS = ('test_name', 'subject', 'duration', 'total_marks', 'type',
+                    'question', 'options', 'correct_answer', 'marks')
+GRADEBOOK_COLUMNS = ('student', 'test_id', 'test_name', 'date', 'evaluated',
+                     'score', 'total_marks', 'percentage')
+
+ImportResult = namedtuple('ImportResult', ['imported', 'rejected', 'questions', 'errors'])
+
+
+def _number(value):
+    """Parse '3' as 3 and '1.5' as 1.5; anything else is returned unchanged"""
+    if isinstance(value, str):
+        value = value.strip()
+        for parse in (int, float):
+            try:
+                return parse(value)
+            except ValueError:
+                continue
+    return value
+
+
+def _options(value):
+    if isinstance(value, list):
+        return [str(option) for option in value]
+    if not value:
+        return []
+    return [option.strip() for option in str(value).split('|')]
+
+
+def read_rows(stream, fmt):
+    """Yield (line_number, row dict) from a CSV or JSONL text stream"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == 'jsonl':
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {line_number} is not valid JSON: {e}") from None
+    else:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+
+def iter_tests(rows, created_by):
+    """Group consecutive question rows into tests
+
+    Yields (first_line_number, test) for each test in the order it appears.
+    """
+    test, first_line, key = None, None, None
+    for line_number, row in rows:
+        if 'questions' in row:
+            # A whole test on one JSONL line
+            if test is not None:
+                yield first_line, test
+                test, key = None, None
+            whole = dict(row)
+            whole.setdefault('id', str(uuid.uuid4()))
+            whole.setdefault('created_by', created_by)
+            whole.setdefault('created_at', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            yield line_number, whole
+            continue
+
+        row_key = (row.get('test_name'), row.get('subject'))
+        if row_key != key:
+            if test is not None:
+                yield first_line, test
+            key, first_line = row_key, line_number
+            test = {
+                "id": str(uuid.uuid4()),
+                "name": row.get('test_name'),
+                "subject": row.get('subject') or '',
+                "duration": _number(row.get('duration') or 60),
+                "total_marks": _number(row.get('total_marks')),
+                "questions": [],
+                "created_by": created_by,
+                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+        q_type = row.get('type')
+        options = _options(row.get('options'))
+        if q_type == 'True/False' and not options:
+            options = ["True", "False"]
+        test['questions'].append({
+            "id": str(uuid.uuid4()),
+            "type": q_type,
+            "question": row.get('question'),
+            "options": options,
+            "correct_answer": row.get('correct_answer'),
+            "marks": _number(row.get('marks'))
+        })
+    if test is not None:
+        yield first_line, test
+
+
+def import_tests(stream, fmt, created_by, repository=None):
+    """Validate and save every test in a CSV/JSONL text stream
+
+    Invalid tests are skipped and reported in ImportResult.errors as
+    (line_number, test_name, problems); valid ones are saved in batches.
+    Raises ValueError at the first line that cannot be parsed.
+    """
+    repository = repository or get_repository()
+    batch = []
+    imported = rejected = questions = 0
+    errors = []
+    try:
+        for line_number, test in iter_tests(read_rows(stream, fmt), created_by):
+            problems = validate_test(test)
+            if problems:
+                rejected += 1
+                if len(errors) < MAX_ERRORS:
+                    errors.append((line_number, test.get('name'), problems))
+                continue
+            batch.append(test)
+            questions += len(test['questions'])
+            if len(batch) >= IMPORT_BATCH:
+                repository.add_tests(batch)
+                imported += len(batch)
+                batch = []
+    finally:
+        # A malformed line stops the import; tests read before it are still saved
+        if batch:
+            repository.add_tests(batch)
+            imported += len(batch)
+    return ImportResult(imported, rejected, questions, errors)
+
+
+def import_upload(upload, created_by, repository=None):
+    """Import from a Streamlit UploadedFile, picking the format from its name"""
+    fmt = 'jsonl' if upload.name.lower().endswith(('.jsonl', '.json')) else 'csv'
+    stream = io.TextIOWrapper(upload, encoding='utf-8', newline='')
+    try:
+        return import_tests(stream, fmt, created_by, repository)
+    finally:
+        stream.detach()
+
+
+def gradebook_row(submission):
+    percentage = submission_percentage(submission)
+    evaluated = bool(submission.get('evaluated'))
+    return {
+        'student': submission.get('student'),
+        'test_id': submission.get('test_id'),
+        'test_name': submission.get('test_name'),
+        'date': submission.get('date'),
+        'evaluated': evaluated,
+        'score': submission.get('score') if evaluated else None,
+        'total_marks': submission.get('total_marks') if evaluated else None,
+        'percentage': round(percentage, 2) if percentage is not None else None,
+    }
+
+
+def export_gradebook(out, fmt='csv', submissions=None, repository=None):
+    """Write one gradebook row per submission to a text stream; returns the row count"""
+    if submissions is None:
+        submissions = (repository or get_repository()).iter_submissions()
+    if fmt == 'csv':
+        writer = csv.DictWriter(out, fieldnames=GRADEBOOK_COLUMNS)
+        writer.writeheader()
+        write = writer.writerow
+    elif fmt == 'jsonl':
+        write = lambda row: out.write(json.dumps(row) + '\n')
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    count = 0
+    for submission in submissions:
+        write(gradebook_row(submission))
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    command, path = sys.argv[1], sys.argv[2]
+    fmt = 'jsonl' if path.lower().endswith(('.jsonl', '.json')) else 'csv'
+    if command == 'import':
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            result = import_tests(f, fmt, sys.argv[3] if len(sys.argv) > 3 else 'import')
+        print(f"Imported {result.imported} tests ({result.questions} questions), "
+              f"rejected {result.rejected}")
+        for line_number, name, problems in result.errors:
+            print(f"  line {line_number} ({name}): {'; '.join(problems)}")
+    elif command == 'export':
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            print(f"Exported {export_gradebook(f, fmt)} submissions to {path}")
+    else:
+        sys.exit("usage: python -m lms.bulk import FILE [USERNAME] | export FILE")
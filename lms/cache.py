@@ -0,0 +1,95 @@
+"""Process-wide cache of parsed JSON files.
+
+Every Streamlit session runs in the same process, so they can share one parsed
+copy of tests.json, notes.json and the rest. An entry is reused while the file's
+mtime and size are unchanged. Our own writes drop it explicitly, and the least
+recently used files are evicted once the cached files exceed CACHE_MAX_BYTES.
+
+Cached values are shared between sessions: treat them as read-only and copy
+before mutating.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from lms.config import CACHE_MAX_BYTES
+
+
+class JsonFileCache:
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (stamp, value, cost)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load(self, path, default=None):
+        """Return the parsed contents of path, or default if missing/invalid"""
+        path = str(path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self.invalidate(path)
+            return default
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        try:
+            with open(path, 'r') as f:
+                content = f.read()
+            value = json.loads(content) if content else None
+        except (FileNotFoundError, json.JSONDecodeError):
+            value = None
+        if value is None:
+            return default
+
+        with self._lock:
+            self._store(path, stamp, value, stat.st_size)
+        return value
+
+    def invalidate(self, path=None):
+        """Drop one file, or everything when path is None"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._total_bytes = 0
+                return
+            entry = self._entries.pop(str(path), None)
+            if entry is not None:
+                self._total_bytes -= entry[2]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+            }
+
+    def _store(self, path, stamp, value, cost):
+        old = self._entries.pop(path, None)
+        if old is not None:
+            self._total_bytes -= old[2]
+        if cost > self.max_bytes:
+            return
+        self._entries[path] = (stamp, value, cost)
+        self._total_bytes += cost
+        while self._total_bytes > self.max_bytes:
+            _, (_, _, evicted_cost) = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_cost
+            self.evictions += 1
+
+
+json_cache = JsonFileCache()
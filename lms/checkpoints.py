@@ -0,0 +1,106 @@
+"""Checkpoints of in-progress test attempts.
+
+Each attempt (student, test) has an append-only log at
+``checkpoints/<student>/<test_id>.jsonl``. Every line is a delta mapping
+question keys ('q_0', ...) to their latest answer. Changed answers are held
+for CHECKPOINT_DEBOUNCE seconds, so quick edits to one question are written as
+one value, and a background thread appends them as a single line. A write
+therefore costs O(changed answers), not O(whole submission). load() replays
+the log to resume an attempt, and discard() deletes it once the test is
+submitted.
+"""
+import atexit
+import json
+import os
+import threading
+from urllib.parse import quote
+
+from lms.config import CHECKPOINT_DEBOUNCE, data_path
+from lms.flusher import PeriodicFlusher
+from lms.jsonl import iter_jsonl
+
+# Logs longer than this are rewritten as a single line when replayed
+COMPACT_LINES = 200
+
+
+class CheckpointStore:
+    def __init__(self, root=None, debounce=CHECKPOINT_DEBOUNCE):
+        self.root = str(root or data_path('checkpoints'))
+        self.debounce = debounce
+        self._pending = {}  # (student, test_id) -> {question: answer}
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._flusher = PeriodicFlusher(self.flush, debounce, 'checkpoint-flusher')
+
+    def path(self, student, test_id):
+        return os.path.join(self.root, quote(student, safe=''), f"{quote(test_id, safe='')}.jsonl")
+
+    def record(self, student, test_id, changes):
+        """Queue changed answers ({'q_3': 'True'}) for the next append"""
+        if not changes:
+            return
+        with self._lock:
+            self._pending.setdefault((student, test_id), {}).update(changes)
+        self._flusher.ensure_started()
+
+    def load(self, student, test_id):
+        """Replay the attempt's checkpoint into an answers dict"""
+        answers = {}
+        lines = 0
+        with self._io_lock:
+            for changes in iter_jsonl(self.path(student, test_id)):
+                answers.update(changes)
+                lines += 1
+            if lines > COMPACT_LINES:
+                self._rewrite(student, test_id, answers)
+        with self._lock:
+            answers.update(self._pending.get((student, test_id), {}))
+        return answers
+
+    def discard(self, student, test_id):
+        """Forget the attempt, e.g. after it is submitted"""
+        with self._io_lock:
+            with self._lock:
+                self._pending.pop((student, test_id), None)
+            try:
+                os.remove(self.path(student, test_id))
+            except FileNotFoundError:
+                pass
+
+    def flush(self):
+        """Append every queued delta now"""
+        # Held across the swap so a concurrent discard can't be undone by a late append
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            error = None
+            for (student, test_id), changes in pending.items():
+                path = self.path(student, test_id)
+                try:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, 'a') as f:
+                        f.write(json.dumps(changes) + '\n')
+                except OSError as e:
+                    # Retry on the next flush unless newer answers arrived
+                    error = e
+                    with self._lock:
+                        queued = self._pending.setdefault((student, test_id), {})
+                        for question, answer in changes.items():
+                            queued.setdefault(question, answer)
+            if error is not None:
+                raise error
+
+    def pending_count(self):
+        with self._lock:
+            return sum(len(changes) for changes in self._pending.values())
+
+    def _rewrite(self, student, test_id, answers):
+        path = self.path(student, test_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps(answers) + '\n')
+        os.replace(tmp_path, path)
+
+
+checkpoints = CheckpointStore()
+atexit.register(checkpoints.flush)
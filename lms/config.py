@@ -0,0 +1,47 @@
+"""Paths and settings shared by the helpers in this package."""
+import os
+from pathlib import Path
+
+# Data files live next to app.py unless LMS_DATA_DIR points somewhere else
+DATA_DIR = Path(os.environ.get('LMS_DATA_DIR', Path(__file__).resolve().parent.parent))
+
+
+def data_path(name):
+    """Return the absolute path of a data file such as 'tests.json'"""
+    return DATA_DIR / name
+
+
+# 'json' keeps the original flat files; 'sqlite' uses lms.db (see lms.sqlite_store)
+STORAGE_BACKEND = os.environ.get('LMS_STORAGE_BACKEND', 'json').lower()
+SQLITE_PATH = Path(os.environ.get('LMS_SQLITE_PATH', DATA_DIR / 'lms.db'))
+
+# Upper bound on the size of JSON files kept parsed in the shared read cache
+CACHE_MAX_BYTES = int(os.environ.get('LMS_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+# Seconds a JSON writer waits to batch concurrent saves into one file write
+WRITE_FLUSH_INTERVAL = float(os.environ.get('LMS_WRITE_FLUSH_INTERVAL', 0.1))
+
+# Short-answer keyword matching: 'substring' (original semantics) or 'token'
+KEYWORD_MATCH_MODE = os.environ.get('LMS_KEYWORD_MATCH', 'substring').lower()
+
+# Background threads grading submissions as they arrive
+GRADING_WORKERS = int(os.environ.get('LMS_GRADING_WORKERS', 2))
+
+# Parquet snapshots of submissions and study sessions (see lms.analytics)
+ANALYTICS_DIR = Path(os.environ.get('LMS_ANALYTICS_DIR', DATA_DIR / 'analytics'))
+ANALYTICS_EXPORT_INTERVAL = float(os.environ.get('LMS_ANALYTICS_EXPORT_INTERVAL', 15 * 60))
+
+# Seconds answer changes are held before being appended to a test checkpoint
+CHECKPOINT_DEBOUNCE = float(os.environ.get('LMS_CHECKPOINT_DEBOUNCE', 1.0))
+
+# Camera or replay source for concentration monitoring (see lms.frame_sources)
+FRAME_SOURCE = os.environ.get('LMS_FRAME_SOURCE', 'webcam:0')
+
+# Share of wall-clock time the concentration detector may spend on inference;
+# frames are skipped adaptively to stay under it
+DETECTOR_CPU_BUDGET = float(os.environ.get('LMS_DETECTOR_CPU_BUDGET', 0.5))
+DETECTOR_MAX_FRAME_SKIP = int(os.environ.get('LMS_DETECTOR_MAX_FRAME_SKIP', 10))
+
+# Face landmark model for concentration monitoring: 'face_mesh' (face only) or
+# 'holistic' (face, pose and hands; see lms.face_landmarks)
+DETECTOR_BACKEND = os.environ.get('LMS_DETECTOR_BACKEND', 'face_mesh')
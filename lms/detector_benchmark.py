@@ -0,0 +1,111 @@
+"""Offline replay benchmark for the concentration detector.
+
+Replays a frame source through ConcentrationDetector.calibrate and
+process_frame as fast as the detector allows, then reports throughput,
+per-frame latency percentiles and the session report. A recorded clip or
+image directory gives the same frames on every run, so before/after numbers
+for detector changes are comparable on machines without a camera:
+
+    python -m lms.detector_benchmark clip.mp4
+    python -m lms.detector_benchmark frames/ --max-frames 900 --json
+    python -m lms.detector_benchmark synthetic:600
+    python -m lms.detector_benchmark clip.mp4 --backend holistic
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from lms.frame_sources import open_source
+
+
+def run_benchmark(source, detector=None, max_frames=None, max_calibration_frames=None,
+                  backend=None):
+    """Replay source through a detector and return the benchmark results
+
+    Calibration stops after max_calibration_frames reads (twice the
+    detector's calibration_frames by default) so clips without a face are
+    still measured. backend names the landmark backend for the default
+    detector (LMS_DETECTOR_BACKEND if None).
+    """
+    if detector is None:
+        from pages.selfstudy import ConcentrationDetector
+        detector = ConcentrationDetector(backend=backend)
+    if max_calibration_frames is None:
+        max_calibration_frames = detector.calibration_frames * 2
+
+    calibration_frames = 0
+    calibration_start = time.perf_counter()
+    calibrated = False
+    while calibration_frames < max_calibration_frames:
+        ok, frame = source.read()
+        if not ok:
+            break
+        calibration_frames += 1
+        if detector.calibrate(frame):
+            calibrated = True
+            break
+    calibration_seconds = time.perf_counter() - calibration_start
+
+    # Frames are stamped at the source's nominal rate, so the report's
+    # durations describe the clip rather than how fast it was replayed
+    latencies = []
+    start = time.perf_counter()
+    while max_frames is None or len(latencies) < max_frames:
+        ok, frame = source.read()
+        if not ok:
+            break
+        frame_start = time.perf_counter()
+        detector.process_frame(frame, len(latencies) / source.fps)
+        latencies.append(time.perf_counter() - frame_start)
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    percentiles = (dict(zip(('p50', 'p90', 'p99', 'max'),
+                            np.percentile(latencies_ms, [50, 90, 99, 100]).round(2).tolist()))
+                   if latencies else {})
+    return {
+        'frames': len(latencies),
+        'seconds': round(elapsed, 3),
+        'fps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': percentiles,
+        'calibration': {'frames': calibration_frames, 'calibrated': calibrated,
+                        'seconds': round(calibration_seconds, 3)},
+        'report': detector.get_report(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('source', help="clip path, image directory, 'synthetic[:N]' or 'webcam[:N]'")
+    parser.add_argument('--max-frames', type=int, default=None)
+    parser.add_argument('--calibration-frames', type=int, default=None,
+                        help="frames to try calibrating on before measuring")
+    parser.add_argument('--backend', default=None,
+                        help="landmark backend, 'face_mesh' or 'holistic' (default LMS_DETECTOR_BACKEND)")
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    with open_source(args.source) as source:
+        results = run_benchmark(source, max_frames=args.max_frames,
+                                max_calibration_frames=args.calibration_frames,
+                                backend=args.backend)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{results['frames']} frames in {results['seconds']}s ({results['fps']} fps)")
+    processing = results['report']['processing']
+    print(f"Frame skip: {processing['frame_skip']} "
+          f"(average {processing['average_frame_skip']:.2f}, "
+          f"{processing['inference_ms']:.1f} ms per inference)")
+    print("Latency (ms): " + ", ".join(f"{k} {v}" for k, v in results['latency_ms'].items()))
+    calibration = results['calibration']
+    print(f"Calibration: {calibration['frames']} frames, "
+          f"{'done' if calibration['calibrated'] else 'not reached'}, {calibration['seconds']}s")
+    print(json.dumps(results['report'], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Face landmark backends for the concentration detector.
+
+The detector only reads the 468-point face mesh. A backend takes an RGB frame
+and returns that mesh (a NormalizedLandmarkList) or None when no face is
+found:
+
+* FaceMeshBackend: MediaPipe FaceMesh, face only (the default)
+* HolisticBackend: MediaPipe Holistic, which also runs the pose and hand
+  models and costs several times more per frame
+
+Both use the same face-mesh topology, so the landmark indices in
+pages.selfstudy hold for either. LMS_DETECTOR_BACKEND picks one per
+deployment ('face_mesh' or 'holistic').
+"""
+import mediapipe as mp
+
+
+class LandmarkBackend:
+    def process(self, rgb_frame):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class FaceMeshBackend(LandmarkBackend):
+    def __init__(self, min_detection_confidence=0.3, min_tracking_confidence=0.3):
+        self.face_mesh = mp.solutions.face_mesh.FaceMesh(
+            max_num_faces=1,
+            refine_landmarks=False,  # Iris points are not used
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+    def process(self, rgb_frame):
+        faces = self.face_mesh.process(rgb_frame).multi_face_landmarks
+        return faces[0] if faces else None
+
+    def close(self):
+        self.face_mesh.close()
+
+
+class HolisticBackend(LandmarkBackend):
+    def __init__(self, min_detection_confidence=0.3, min_tracking_confidence=0.3):
+        self.holistic = mp.solutions.holistic.Holistic(
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            model_complexity=0  # Use fastest model
+        )
+
+    def process(self, rgb_frame):
+        return self.holistic.process(rgb_frame).face_landmarks
+
+    def close(self):
+        self.holistic.close()
+
+
+BACKENDS = {
+    'face_mesh': FaceMeshBackend,
+    'holistic': HolisticBackend,
+}
+
+
+def create_backend(name):
+    """Build a landmark backend by name; see BACKENDS"""
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown detector backend: {name}") from None
@@ -0,0 +1,45 @@
+"""Cursor-based paging over newest-first post lists.
+
+A cursor is the (timestamp, id) of the last post on the previous page. Paging
+from a cursor rather than a page number keeps windows stable when new posts
+are inserted at the top of the feed while someone is scrolling.
+"""
+PAGE_SIZE = 20
+
+
+def post_cursor(post):
+    return (post.get('timestamp', ''), post.get('id', ''))
+
+
+def page_after(posts, cursor=None, page_size=PAGE_SIZE):
+    """Return ([(index, post), ...], next_cursor) for the page after cursor
+
+    posts are normally newest first, but need not be strictly ordered: a post
+    shared from a club keeps its old timestamp at the top of the general feed.
+    The cursor post is therefore found by id, and (timestamp, id) order is
+    only used to resume when it has been deleted. next_cursor is None on the
+    last page.
+    """
+    start = 0
+    if cursor is not None:
+        start = _find(posts, cursor)
+    end = min(start + page_size, len(posts))
+    page = [(i, posts[i]) for i in range(start, end)]
+    next_cursor = post_cursor(posts[end - 1]) if page and end < len(posts) else None
+    return page, next_cursor
+
+
+def _find(posts, cursor):
+    """Index just after the cursor post"""
+    cursor = tuple(cursor)
+    post_id = cursor[1]
+    for i, post in enumerate(posts):
+        if (post.get('id') == post_id) if post_id else (post_cursor(post) == cursor):
+            return i + 1
+    # The cursor post was deleted; resume after the last post newer than it,
+    # so an old post shared to the top does not send the reader back there
+    start = 0
+    for i, post in enumerate(posts):
+        if post_cursor(post) > cursor:
+            start = i + 1
+    return start
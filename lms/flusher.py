@@ -0,0 +1,36 @@
+"""Background thread that flushes queued writes on a fixed interval."""
+import threading
+
+
+class PeriodicFlusher:
+    """Calls flush() every interval seconds on a daemon thread
+
+    The thread is started lazily by ensure_started(), so stores that never
+    queue anything never start one. A failed flush is retried on the next
+    tick; flush() is expected to keep whatever it could not write.
+    """
+
+    def __init__(self, flush, interval, name):
+        self.flush = flush
+        self.interval = interval
+        self.name = name
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def ensure_started(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+            self._thread.start()
+
+    def stop(self):
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._wakeup.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                continue
@@ -0,0 +1,225 @@
+"""Capture -> inference -> render pipeline for camera frames.
+
+Reading the camera, running MediaPipe and drawing in Streamlit each take a
+slice of every frame. Done in one loop, those slices add up, and when
+inference is slower than the camera, frames pile up in the driver and the
+picture lags further and further behind. FramePipeline runs capture and
+inference on their own threads. They are joined by LatestFrameBuffers: small
+ring buffers that drop the oldest entry when a new one arrives. Each stage
+always picks up the newest frame, so end-to-end latency stays at about one
+frame however slow inference gets. Rendering stays on the caller's thread,
+because Streamlit elements must be updated from the script thread.
+"""
+import math
+import threading
+import time
+from collections import deque
+
+
+class LatestFrameBuffer:
+    """Bounded ring buffer that overwrites the oldest item when full"""
+
+    def __init__(self, capacity=1):
+        self._items = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Return the newest item, discarding older ones
+
+        Returns None on timeout, or once the buffer is closed and empty.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self.closed, timeout):
+                return None
+            if not self._items:
+                return None
+            item = self._items.pop()
+            self.dropped += len(self._items)
+            self._items.clear()
+            return item
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
+
+
+class FramePipeline:
+    """Runs read_frame and process on background threads
+
+    read_frame() returns (ok, frame) like cv2.VideoCapture.read; the pipeline
+    finishes when it returns ok=False. process(frame, captured_at) runs on the
+    inference thread, with captured_at taken from time.perf_counter when the
+    frame was read, and its output is handed to the caller via next_result().
+    An exception in either thread finishes the pipeline and is kept in
+    .error for the caller to raise.
+    """
+
+    def __init__(self, read_frame, process, capacity=1):
+        self.read_frame = read_frame
+        self.process = process
+        self._captured = LatestFrameBuffer(capacity)
+        self._results = LatestFrameBuffer(capacity)
+        self._stop = threading.Event()
+        self._threads = []
+        self.frames_captured = 0
+        self.frames_processed = 0
+        self.frames_rendered = 0
+        self.inference_seconds = 0.0
+        self.last_latency = 0.0
+        self.error = None
+
+    def start(self):
+        self._threads = [
+            threading.Thread(target=self._capture_loop, daemon=True, name='frame-capture'),
+            threading.Thread(target=self._inference_loop, daemon=True, name='frame-inference'),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    @property
+    def finished(self):
+        """True once no further results can arrive"""
+        return self._results.closed and not len(self._results)
+
+    def next_result(self, timeout=None):
+        """Return (captured_at, output) for the newest processed frame, or None"""
+        item = self._results.get(timeout)
+        if item is not None:
+            self.frames_rendered += 1
+            self.last_latency = time.perf_counter() - item[0]
+        return item
+
+    def stop(self):
+        self._stop.set()
+        self._captured.close()
+        self._results.close()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=5)
+
+    def stats(self):
+        """Queue depth and drop count per stage, plus throughput and latency"""
+        return {
+            'capture_queue': len(self._captured),
+            'render_queue': len(self._results),
+            'dropped_before_inference': self._captured.dropped,
+            'dropped_before_render': self._results.dropped,
+            'captured': self.frames_captured,
+            'processed': self.frames_processed,
+            'rendered': self.frames_rendered,
+            'inference_ms': (self.inference_seconds / self.frames_processed * 1000
+                             if self.frames_processed else 0.0),
+            'latency_ms': self.last_latency * 1000,
+        }
+
+    def _capture_loop(self):
+        try:
+            while not self._stop.is_set():
+                ok, frame = self.read_frame()
+                if not ok:
+                    break
+                self.frames_captured += 1
+                self._captured.put((time.perf_counter(), frame))
+        except Exception as e:
+            self.error = e
+        finally:
+            self._captured.close()
+
+    def _inference_loop(self):
+        try:
+            while not self._stop.is_set():
+                item = self._captured.get()
+                if item is None:
+                    break
+                captured_at, frame = item
+                start = time.perf_counter()
+                output = self.process(frame, captured_at)
+                self.inference_seconds += time.perf_counter() - start
+                self.frames_processed += 1
+                self._results.put((captured_at, output))
+        except Exception as e:
+            self.error = e
+        finally:
+            self._results.close()
+
+
+class FrameSkipController:
+    """Chooses how many frames to skip to keep inference within a CPU budget
+
+    The controller tracks smoothed averages of the time between offered frames
+    and the time per inference. It processes one frame in every `skip`, with
+    skip chosen so that inference takes at most cpu_budget of wall-clock time.
+    It steps up as soon as the budget is exceeded and down one step at a time
+    once there is clear headroom, so the rate does not oscillate.
+    """
+
+    def __init__(self, cpu_budget=0.5, min_skip=1, max_skip=10, smoothing=0.2):
+        self.cpu_budget = cpu_budget
+        self.min_skip = min_skip
+        self.max_skip = max_skip
+        self.smoothing = smoothing
+        self.skip = min_skip
+        self.frame_interval = None
+        self.inference_time = None
+        self.frames_seen = 0
+        self.frames_processed = 0
+        self._last_timestamp = None
+        self._since_processed = 0
+
+    def offer(self, timestamp):
+        """Record a new frame; returns True if it should be processed"""
+        if self._last_timestamp is not None:
+            self.frame_interval = self._smooth(self.frame_interval, timestamp - self._last_timestamp)
+        self._last_timestamp = timestamp
+        self.frames_seen += 1
+        self._since_processed += 1
+        if self._since_processed < self.skip:
+            return False
+        self._since_processed = 0
+        self.frames_processed += 1
+        return True
+
+    def record_inference(self, seconds):
+        self.inference_time = self._smooth(self.inference_time, seconds)
+        if not self.frame_interval:
+            return
+        needed = self.inference_time / (self.cpu_budget * self.frame_interval)
+        target = min(max(math.ceil(needed), self.min_skip), self.max_skip)
+        if target > self.skip:
+            self.skip = target
+        elif target < self.skip and needed < (self.skip - 1) * 0.9:
+            self.skip -= 1
+
+    @property
+    def cpu_share(self):
+        """Estimated share of wall-clock time spent on inference"""
+        if not self.frame_interval or self.inference_time is None:
+            return 0.0
+        return self.inference_time / (self.skip * self.frame_interval)
+
+    def stats(self):
+        return {
+            'frame_skip': self.skip,
+            'average_frame_skip': (self.frames_seen / self.frames_processed
+                                   if self.frames_processed else float(self.skip)),
+            'inference_ms': (self.inference_time or 0.0) * 1000,
+            'cpu_share': self.cpu_share,
+        }
+
+    def _smooth(self, average, value):
+        return value if average is None else average + self.smoothing * (value - average)
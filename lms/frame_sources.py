@@ -0,0 +1,117 @@
+"""Frame sources for the concentration detector.
+
+Every source has cv2.VideoCapture's read() -> (ok, frame) and release(), so
+the detector and FramePipeline can take any of them:
+
+* WebcamSource: a local camera (the default)
+* VideoFileSource: a recorded clip
+* ImageDirectorySource: a folder of still frames, replayed in name order
+* SyntheticSource: generated frames for headless throughput checks
+
+open_source() builds one from a spec string ('webcam', 'webcam:1',
+'synthetic', 'synthetic:600', or a file or directory path). The live pages use
+LMS_FRAME_SOURCE, which defaults to 'webcam:0'.
+"""
+import os
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class FrameSource:
+    fps = 30.0
+
+    def read(self):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def is_opened(self):
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class WebcamSource(FrameSource):
+    def __init__(self, index=0, width=640, height=480):
+        self.capture = cv2.VideoCapture(index)
+        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+
+    def read(self):
+        return self.capture.read()
+
+    def release(self):
+        if self.capture.isOpened():
+            self.capture.release()
+
+    def is_opened(self):
+        return self.capture.isOpened()
+
+
+class VideoFileSource(WebcamSource):
+    def __init__(self, path):
+        self.capture = cv2.VideoCapture(str(path))
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+
+
+class ImageDirectorySource(FrameSource):
+    def __init__(self, path, fps=30.0):
+        self.paths = sorted(os.path.join(path, name) for name in os.listdir(path)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        self.fps = fps
+        self._next = 0
+
+    def read(self):
+        while self._next < len(self.paths):
+            frame = cv2.imread(self.paths[self._next])
+            self._next += 1
+            if frame is not None:
+                return True, frame
+        return False, None
+
+    def is_opened(self):
+        return bool(self.paths)
+
+
+class SyntheticSource(FrameSource):
+    """Deterministic moving-gradient frames; contains no face"""
+
+    def __init__(self, frames=300, width=640, height=480, fps=30.0):
+        self.frames = frames
+        self.fps = fps
+        self._count = 0
+        x = np.linspace(0, 255, width, dtype=np.float32)
+        y = np.linspace(0, 255, height, dtype=np.float32)
+        self._base = (x[None, :] + y[:, None]) / 2
+
+    def read(self):
+        if self.frames is not None and self._count >= self.frames:
+            return False, None
+        shift = (self._count * 4) % 256
+        channel = ((self._base + shift) % 256).astype(np.uint8)
+        self._count += 1
+        return True, np.dstack([channel, channel[:, ::-1], channel[::-1, :]])
+
+
+def open_source(spec):
+    """Build a FrameSource from a spec string; see the module docstring"""
+    spec = str(spec)
+    kind, _, arg = spec.partition(':')
+    if kind == 'webcam':
+        return WebcamSource(int(arg or 0))
+    if kind == 'synthetic':
+        return SyntheticSource(int(arg) if arg else 300)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec)
+    if os.path.exists(spec):
+        return VideoFileSource(spec)
+    raise ValueError(f"Unknown frame source: {spec}")
@@ -0,0 +1,107 @@
+"""Batch grading of test submissions.
+
+Each test is compiled once into an answer key: one entry per question with its
+type, correct answer, marks and compiled keyword matcher (see lms.scoring). Every pending
+submission is then graded against its key in a single pass, and the results
+are persisted with one repository write.
+"""
+import time
+from collections import namedtuple
+
+from lms.scoring import get_matcher
+from lms.stats import class_stats
+
+SHORT_ANSWER = 'Short Answer'
+
+KeyEntry = namedtuple('KeyEntry', ['type', 'correct_answer', 'marks', 'matcher'])
+AnswerKey = namedtuple('AnswerKey', ['test_id', 'total_marks', 'entries'])
+BatchResult = namedtuple('BatchResult', ['graded', 'tests_compiled', 'seconds'])
+
+# Callbacks run with each list of newly saved graded submissions
+_graded_listeners = []
+
+
+def on_graded(callback):
+    """Register callback(graded) to run after graded submissions are saved"""
+    _graded_listeners.append(callback)
+
+
+def compile_answer_key(test):
+    """Build the answer key for a test dict"""
+    entries = []
+    for question in test['questions']:
+        correct = question['correct_answer']
+        matcher = get_matcher(correct) if question['type'] == SHORT_ANSWER else None
+        entries.append(KeyEntry(question['type'], correct, question['marks'], matcher))
+    return AnswerKey(test['id'], test['total_marks'], tuple(entries))
+
+
+def grade_answers(key, answers):
+    """Grade an answers dict ({'q_0': ..., ...}) against an answer key
+
+    Returns (score, total_marks, feedback), with one feedback line per
+    question in the format professors have always been shown.
+    """
+    score = 0
+    feedback = []
+
+    for question, answer in answers.items():
+        q_index = int(question.split('_')[1])
+        entry = key.entries[q_index]
+        marks = entry.marks
+
+        if entry.type == SHORT_ANSWER:
+            # For short answers, check if key words from correct answer appear in student's answer
+            accuracy = entry.matcher.accuracy(answer)
+            question_score = marks * accuracy
+            score += question_score
+            feedback.append(f"Q{q_index + 1}: {question_score}/{marks} marks - {accuracy*100:.0f}% keyword match")
+        elif answer == entry.correct_answer:
+            score += marks
+            feedback.append(f"Q{q_index + 1}: {marks}/{marks} marks - Correct")
+        else:
+            feedback.append(f"Q{q_index + 1}: 0/{marks} marks - Incorrect. Correct answer: {entry.correct_answer}")
+
+    return score, key.total_marks, "\n".join(feedback)
+
+
+def grade_submission(submission, key):
+    """Return a graded copy of the submission; key is None if its test is gone"""
+    if key is None:
+        score, total_marks, feedback = 0, 0, "Test not found"
+    else:
+        score, total_marks, feedback = grade_answers(key, submission['answers'])
+    return {**submission, 'score': score, 'total_marks': total_marks,
+            'feedback': feedback, 'evaluated': True}
+
+
+def save_graded(repository, graded):
+    """Persist graded submissions and fold them into the class statistics"""
+    if not graded:
+        return
+    repository.update_submissions(graded)
+    class_stats.record(graded)
+    for callback in _graded_listeners:
+        callback(graded)
+
+
+def grade_pending(submissions, repository):
+    """Grade every unevaluated submission and save them in one write
+
+    Each test is loaded and compiled once per batch. Returns a BatchResult with
+    the graded submissions, the number of tests compiled and the elapsed time.
+    """
+    start = time.perf_counter()
+    keys = {}
+    graded = []
+    for sub in submissions:
+        if sub.get('evaluated'):
+            continue
+        test_id = sub['test_id']
+        if test_id not in keys:
+            test = repository.get_test(test_id)
+            keys[test_id] = compile_answer_key(test) if test else None
+        graded.append(grade_submission(sub, keys[test_id]))
+
+    save_graded(repository, graded)
+    return BatchResult(graded, len(keys), time.perf_counter() - start)
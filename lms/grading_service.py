@@ -0,0 +1,134 @@
+"""Background grading of submissions as soon as they are saved.
+
+test_interface.save_submission enqueues each new submission. A small pool of
+worker threads drains the queue in batches, each graded with
+lms.grading.grade_pending: each test in a batch is compiled once, and all
+results are saved with one repository write. Professors read
+graded results instead of waiting for grading on their own rerun. Submissions
+that were pending when the service started are queued on startup. The ids of
+recently queued submissions are remembered, so a submission both picked up
+from the backlog and enqueued by its session is graded once.
+"""
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+
+from lms.config import GRADING_WORKERS
+from lms.grading import grade_pending
+from lms.repository import get_repository
+
+# Largest number of submissions graded and written together
+MAX_BATCH = 50
+
+# Submission ids remembered to stop the same submission being queued twice
+SEEN_IDS = 10000
+
+
+class GradingService:
+    def __init__(self, repository=None, workers=GRADING_WORKERS):
+        self._repository = repository
+        self.workers = workers
+        self.processed = 0
+        self.failed = 0
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=1000)
+        self._batches = deque(maxlen=100)  # (graded, tests compiled, seconds) per batch
+        self._lock = threading.Lock()
+        self._threads = []
+        self._seen_ids = OrderedDict()
+
+    @property
+    def repository(self):
+        return self._repository or get_repository()
+
+    def start(self):
+        """Start the workers and queue any submissions left ungraded
+
+        Returns the ids queued from the backlog (empty if already running).
+        """
+        with self._lock:
+            if self._threads:
+                return set()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, daemon=True, name=f'grader-{i}')
+                thread.start()
+                self._threads.append(thread)
+        queued = set()
+        for sub in self.repository.iter_submissions():
+            if not sub.get('evaluated') and self._put(sub):
+                queued.add(sub.get('id'))
+        return queued
+
+    def enqueue(self, submission):
+        """Queue a saved submission for grading unless it is already queued"""
+        self.start()
+        self._put(submission)
+
+    def _put(self, submission):
+        sub_id = submission.get('id')
+        with self._lock:
+            if sub_id in self._seen_ids:
+                return False
+            self._seen_ids[sub_id] = None
+            if len(self._seen_ids) > SEEN_IDS:
+                self._seen_ids.popitem(last=False)
+        self._queue.put((time.monotonic(), submission))
+        return True
+
+    def drain(self):
+        """Block until every queued submission has been graded"""
+        self._queue.join()
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            batches = list(self._batches)
+            processed, failed = self.processed, self.failed
+        batch_graded = sum(graded for graded, _, _ in batches)
+        batch_seconds = sum(seconds for _, _, seconds in batches)
+        return {
+            'queue_depth': self._queue.qsize(),
+            'processed': processed,
+            'failed': failed,
+            'latency_p50': latencies[len(latencies) // 2] if latencies else 0.0,
+            'latency_p95': latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+            'latency_max': latencies[-1] if latencies else 0.0,
+            # Submissions graded per second of batch grading, over recent batches
+            'throughput': batch_graded / batch_seconds if batch_seconds else 0.0,
+            'tests_per_batch': (sum(tests for _, tests, _ in batches) / len(batches)
+                                if batches else 0.0),
+        }
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < MAX_BATCH:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _work(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._grade_batch(batch)
+            except Exception:
+                with self._lock:
+                    self.failed += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _grade_batch(self, batch):
+        result = grade_pending([sub for _, sub in batch], self.repository)
+
+        now = time.monotonic()
+        with self._lock:
+            self.processed += len(result.graded)
+            self._batches.append((len(result.graded), result.tests_compiled, result.seconds))
+            self._latencies.extend(now - enqueued_at for enqueued_at, _ in batch)
+
+
+grading_service = GradingService()
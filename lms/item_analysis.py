@@ -0,0 +1,156 @@
+"""Per-question item analysis for tests.
+
+Each test's graded submissions become a submissions x questions matrix of
+earned fractions (0-1), plus a matrix of chosen option indices for
+multiple-choice and true/false questions. Metrics are then column operations
+over those matrices:
+
+* p-value: mean fraction earned per question (higher is easier)
+* discrimination: mean fraction in the top 27% of total scores minus the
+  bottom 27%
+* distractors: how often each option was chosen
+
+Results are cached per test and dropped when submissions for that test are
+graded or the test itself is saved again (see lms.grading.on_graded and
+lms.repository.on_test_saved).
+"""
+import threading
+from collections import defaultdict, namedtuple
+
+import numpy as np
+
+from lms.grading import SHORT_ANSWER, compile_answer_key, on_graded
+from lms.repository import get_repository, on_test_saved
+
+# Share of submissions in each of the upper and lower discrimination groups
+GROUP_FRACTION = 0.27
+
+# Index in the choice matrix for unanswered or unrecognised answers
+NO_ANSWER = -1
+
+ItemAnalysis = namedtuple('ItemAnalysis', [
+    'test_id', 'submissions', 'p_values', 'discrimination', 'distractors', 'mean_score'])
+
+
+def build_matrices(test, submissions):
+    """Return (fractions, choices) for a test's graded submissions
+
+    fractions[i, j] is the share of question j's marks earned by submission i.
+    choices[i, j] is the option index chosen, or NO_ANSWER; it is only
+    meaningful for questions with options.
+    """
+    key = compile_answer_key(test)
+    n_questions = len(key.entries)
+    fractions = np.zeros((len(submissions), n_questions))
+    choices = np.full((len(submissions), n_questions), NO_ANSWER, dtype=np.int32)
+    option_index = [{option: i for i, option in enumerate(q.get('options') or [])}
+                    for q in test['questions']]
+    is_short = np.array([entry.type == SHORT_ANSWER for entry in key.entries], dtype=bool)
+
+    for i, sub in enumerate(submissions):
+        for question, answer in sub['answers'].items():
+            j = int(question.split('_')[1])
+            if j >= n_questions:
+                continue
+            if is_short[j]:
+                fractions[i, j] = key.entries[j].matcher.accuracy(answer)
+            else:
+                choices[i, j] = option_index[j].get(answer, NO_ANSWER)
+
+    # Choice questions score by comparing whole columns against the key
+    correct = np.array([index.get(entry.correct_answer, NO_ANSWER)
+                        for index, entry in zip(option_index, key.entries)], dtype=np.int32)
+    choice_cols = ~is_short
+    fractions[:, choice_cols] = ((choices[:, choice_cols] == correct[choice_cols])
+                                 & (correct[choice_cols] != NO_ANSWER))
+    return fractions, choices
+
+
+def analyze(test, submissions):
+    """Compute the item analysis for a test dict and its graded submissions"""
+    fractions, choices = build_matrices(test, submissions)
+    marks = np.array([q['marks'] for q in test['questions']], dtype=float)
+    n = fractions.shape[0]
+
+    if n:
+        p_values = fractions.mean(axis=0)
+        totals = fractions @ marks
+        mean_score = float(totals.mean())
+    else:
+        p_values = np.full(fractions.shape[1], np.nan)
+        mean_score = 0.0
+
+    if n >= 2:
+        order = np.argsort(totals, kind='stable')
+        k = max(1, int(round(n * GROUP_FRACTION)))
+        discrimination = fractions[order[-k:]].mean(axis=0) - fractions[order[:k]].mean(axis=0)
+    else:
+        discrimination = np.full(fractions.shape[1], np.nan)
+
+    distractors = []
+    for j, question in enumerate(test['questions']):
+        options = question.get('options') or []
+        if question['type'] == SHORT_ANSWER or not options:
+            distractors.append(None)
+            continue
+        # Shift by one so NO_ANSWER lands in bin 0
+        counts = np.bincount(choices[:, j] + 1, minlength=len(options) + 1)
+        distractors.append({'(no answer)': int(counts[0]),
+                            **{option: int(c) for option, c in zip(options, counts[1:])}})
+
+    for array in (p_values, discrimination):
+        array.setflags(write=False)
+    return ItemAnalysis(test['id'], n, p_values, discrimination, tuple(distractors), mean_score)
+
+
+class ItemAnalyzer:
+    """Caches one ItemAnalysis per test until its submissions change"""
+
+    def __init__(self, repository=None):
+        self._repository = repository
+        self._results = {}
+        # Bumped on invalidation so a result computed meanwhile is not cached
+        self._generations = defaultdict(int)
+        self._all_generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def repository(self):
+        return self._repository or get_repository()
+
+    def get(self, test_id):
+        """Return the item analysis for test_id, or None if the test is gone"""
+        with self._lock:
+            result = self._results.get(test_id)
+            generation = (self._all_generation, self._generations[test_id])
+        if result is not None:
+            return result
+        test = self.repository.get_test(test_id)
+        if test is None:
+            return None
+        submissions = [sub for sub in self.repository.iter_submissions(test_id=test_id)
+                       if sub.get('evaluated')]
+        result = analyze(test, submissions)
+        with self._lock:
+            if generation == (self._all_generation, self._generations[test_id]):
+                self._results[test_id] = result
+        return result
+
+    def invalidate(self, test_ids=None):
+        """Drop cached results for test_ids, or for every test"""
+        with self._lock:
+            if test_ids is None:
+                self._results.clear()
+                self._all_generation += 1
+            else:
+                for test_id in test_ids:
+                    self._results.pop(test_id, None)
+                    self._generations[test_id] += 1
+
+    def _on_graded(self, graded):
+        self.invalidate({sub['test_id'] for sub in graded})
+
+
+item_analyzer = ItemAnalyzer()
+on_graded(item_analyzer._on_graded)
+on_test_saved(lambda test: item_analyzer.invalidate([test['id']]))
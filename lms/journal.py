@@ -0,0 +1,111 @@
+"""Append-only journal for test submissions.
+
+Saving a submission appends one JSON line to ``submissions.log`` instead of
+rewriting ``submissions.json``. Once the journal grows past a threshold it is
+compacted back into ``submissions.json``, which keeps its original format.
+Records are keyed by ``id``: a later line for the same id (e.g. after grading)
+replaces the earlier version.
+"""
+import json
+import os
+import threading
+
+from lms.cache import json_cache
+from lms.config import data_path
+from lms.jsonl import iter_jsonl
+
+# Compact the journal into the snapshot once it grows past this size
+COMPACT_THRESHOLD_BYTES = 1024 * 1024
+
+
+class SubmissionJournal:
+    def __init__(self, snapshot_path=None, journal_path=None,
+                 compact_threshold=COMPACT_THRESHOLD_BYTES):
+        self.snapshot_path = snapshot_path or data_path('submissions.json')
+        self.journal_path = journal_path or data_path('submissions.log')
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+
+    def append(self, submission):
+        """Record a new or updated submission with a single small write"""
+        self.append_many([submission])
+
+    def append_many(self, submissions):
+        """Record several submissions in one write"""
+        if not submissions:
+            return
+        payload = ''.join(json.dumps(sub) + '\n' for sub in submissions)
+        with self._lock:
+            with open(self.journal_path, 'a') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            journal_size = os.path.getsize(self.journal_path)
+        if journal_size >= self.compact_threshold:
+            self.compact()
+
+    def iter_submissions(self, student=None, test_id=None):
+        """Yield the latest version of every submission, oldest first"""
+        with self._lock:
+            snapshot = self._read_snapshot()
+            journal = list(self._read_journal())
+
+        # The journal is bounded by compaction, so indexing it by id is cheap
+        pending = {}
+        for sub in journal:
+            pending[sub.get('id')] = sub
+
+        def matches(sub):
+            return ((student is None or sub.get('student') == student) and
+                    (test_id is None or sub.get('test_id') == test_id))
+
+        seen = set()
+        for sub in snapshot:
+            sub_id = sub.get('id')
+            seen.add(sub_id)
+            sub = pending.get(sub_id, sub)
+            if matches(sub):
+                # Snapshot records are shared through the cache; hand out copies
+                yield dict(sub)
+        for sub in journal:
+            sub_id = sub.get('id')
+            if sub_id in seen:
+                continue
+            seen.add(sub_id)
+            latest = pending[sub_id]
+            if matches(latest):
+                yield latest
+
+    def load(self):
+        """Return all submissions as a list"""
+        return list(self.iter_submissions())
+
+    def rewrite(self, submissions):
+        """Replace the whole history, e.g. after a bulk edit"""
+        with self._lock:
+            self._write_snapshot(submissions)
+            open(self.journal_path, 'w').close()
+
+    def compact(self):
+        """Fold the journal into the snapshot file and truncate it"""
+        with self._lock:
+            self.rewrite(list(self.iter_submissions()))
+
+    def _read_snapshot(self):
+        data = json_cache.load(self.snapshot_path, [])
+        return data if isinstance(data, list) else list(data.values())
+
+    def _read_journal(self):
+        return iter_jsonl(self.journal_path)
+
+    def _write_snapshot(self, submissions):
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(submissions, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        json_cache.invalidate(self.snapshot_path)
+
+
+submission_journal = SubmissionJournal()
@@ -0,0 +1,23 @@
+"""Reading of the append-only JSONL files under the data directory."""
+import json
+
+
+def iter_jsonl(path):
+    """Yield the record on each line of a JSONL file
+
+    A missing file yields nothing. Blank lines and lines that don't parse
+    (a torn write from a crashed process) are skipped.
+    """
+    try:
+        f = open(path, 'r')
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
@@ -0,0 +1,97 @@
+"""Append-only like counters for social posts.
+
+A like appends one small line to ``post_likes.log`` instead of rewriting
+posts.json. Pending likes are summed in memory and added to the stored count
+when a post is displayed. Every COMPACT_EVERY likes, or after COMPACT_AFTER
+seconds, they are folded into posts.json in one write. Each line carries a
+sequence number. posts.json records the last folded number as ``likes_seq``,
+so a crash between the two steps cannot count a like twice.
+"""
+import json
+import threading
+import time
+from collections import Counter
+
+from lms.cache import json_cache
+from lms.config import data_path
+from lms.jsonl import iter_jsonl
+from lms.writer import get_writer
+
+COMPACT_EVERY = 500
+COMPACT_AFTER = 60.0
+
+POSTS_DEFAULT = {'general': [], 'clubs': {}}
+
+
+def like_key(feed_type, post_id, club_name=None):
+    return (feed_type, club_name if feed_type == 'club' else None, post_id)
+
+
+class LikeJournal:
+    def __init__(self, posts_path=None, log_path=None):
+        self.posts_path = str(posts_path or data_path('posts.json'))
+        self.log_path = str(log_path or data_path('post_likes.log'))
+        self._lock = threading.Lock()
+        self._pending = None
+        self._seq = 0
+        self._last_compaction = time.monotonic()
+
+    def increment(self, feed_type, post_id, club_name=None):
+        """Record one like for a post in the given feed"""
+        with self._lock:
+            self._load()
+            self._seq += 1
+            entry = {'seq': self._seq, 'feed': feed_type, 'club': club_name, 'post': post_id}
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+            self._pending[like_key(feed_type, post_id, club_name)] += 1
+            due = (sum(self._pending.values()) >= COMPACT_EVERY or
+                   time.monotonic() - self._last_compaction >= COMPACT_AFTER)
+        if due:
+            self.compact()
+
+    def likes(self, post, feed_type, club_name=None):
+        """Stored like count of a post plus likes not yet compacted"""
+        with self._lock:
+            self._load()
+            pending = self._pending[like_key(feed_type, post.get('id'), club_name)]
+        return post.get('likes', 0) + pending
+
+    def compact(self):
+        """Fold pending likes into posts.json and truncate the log"""
+        with self._lock:
+            self._load()
+            self._last_compaction = time.monotonic()
+            if not self._pending:
+                return
+            pending, seq = Counter(self._pending), self._seq
+
+            def apply(data):
+                feeds = [('general', None, data.get('general', []))]
+                feeds += [('club', club, posts) for club, posts in data.get('clubs', {}).items()]
+                for feed_type, club_name, posts in feeds:
+                    for post in posts:
+                        post['likes'] = post.get('likes', 0) + pending[
+                            like_key(feed_type, post.get('id'), club_name)]
+                data['likes_seq'] = seq
+
+            get_writer(self.posts_path).submit(apply, POSTS_DEFAULT).result()
+            open(self.log_path, 'w').close()
+            self._pending = Counter()
+
+    def _load(self):
+        # Replay the log once per process, skipping entries already folded in
+        if self._pending is not None:
+            return
+        folded = json_cache.load(self.posts_path, {}).get('likes_seq', 0)
+        self._pending = Counter()
+        self._seq = folded
+        for entry in iter_jsonl(self.log_path):
+            if not isinstance(entry, dict) or 'seq' not in entry:
+                continue
+            self._seq = max(self._seq, entry['seq'])
+            if entry['seq'] > folded:
+                self._pending[like_key(entry.get('feed'), entry.get('post'), entry.get('club'))] += 1
+
+
+like_journal = LikeJournal()
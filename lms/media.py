@@ -0,0 +1,77 @@
+"""Disk-backed image store for social posts.
+
+Each uploaded image is decoded once and saved as a WebP thumbnail, the size
+the feed renders, keyed by the SHA-256 of the upload. Posts store only that key, so
+posts.json stays small and feed rendering serves files from disk. Run
+``python -m lms.media`` to move base64 images from older posts into the store.
+"""
+import base64
+import hashlib
+import io
+import os
+
+from PIL import Image
+
+from lms.config import data_path
+
+# Only sizes the feed actually renders are stored
+SIZES = {
+    'thumb': (400, 400),
+}
+IMAGE_FORMAT = 'WEBP'
+IMAGE_QUALITY = 80
+
+
+class MediaStore:
+    def __init__(self, root=None):
+        self.root = root or data_path('media')
+
+    def path(self, key, size='thumb'):
+        return os.path.join(self.root, key[:2], f"{key}_{size}.webp")
+
+    def exists(self, key):
+        return all(os.path.exists(self.path(key, size)) for size in SIZES)
+
+    def put_image(self, data):
+        """Store an image in every size and return its media key"""
+        key = hashlib.sha256(data).hexdigest()
+        if self.exists(key):
+            return key
+        image = Image.open(io.BytesIO(data))
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+        os.makedirs(os.path.join(self.root, key[:2]), exist_ok=True)
+        for size, max_size in SIZES.items():
+            resized = image.copy()
+            resized.thumbnail(max_size, Image.Resampling.LANCZOS)
+            path = self.path(key, size)
+            tmp_path = f"{path}.tmp"
+            resized.save(tmp_path, format=IMAGE_FORMAT, quality=IMAGE_QUALITY)
+            os.replace(tmp_path, path)
+        return key
+
+
+media_store = MediaStore()
+
+
+def move_post_images_to_media(posts_file=None):
+    """Replace base64 'image' fields in posts.json with media keys
+
+    Returns the number of posts that were rewritten.
+    """
+    from lms.repository import update_json
+
+    def externalize(data):
+        moved = 0
+        for posts in [data.get('general', [])] + list(data.get('clubs', {}).values()):
+            for post in posts:
+                if post.get('image'):
+                    post['media_key'] = media_store.put_image(base64.b64decode(post.pop('image')))
+                    moved += 1
+        return moved
+
+    return update_json(posts_file or 'posts.json', {}, externalize).result()
+
+
+if __name__ == "__main__":
+    print(f"Moved {move_post_images_to_media()} post images into {media_store.root}")
@@ -0,0 +1,125 @@
+"""Process-wide cache of parsed, validated tests.
+
+The exam page reruns on every widget interaction and needs the running test
+each time. The first request for a test id loads it from the repository,
+validates it and freezes it: dicts become read-only mappings and lists become
+tuples. The frozen test is shared by every session until the test is saved
+again (see lms.repository.on_test_saved).
+"""
+import threading
+from collections import defaultdict
+from types import MappingProxyType
+
+from lms.repository import get_repository, on_test_saved
+
+QUESTION_TYPES = ('Multiple Choice', 'True/False', 'Short Answer')
+CHOICE_TYPES = ('Multiple Choice', 'True/False')
+
+
+class InvalidTestError(ValueError):
+    """Raised for a stored test that fails validate_test"""
+
+    def __init__(self, test_id, problems):
+        super().__init__(f"Test {test_id} is invalid: " + "; ".join(problems))
+        self.test_id = test_id
+        self.problems = problems
+
+
+def validate_test(test):
+    """Return a list of problems with a test dict; empty if it is valid"""
+    problems = []
+    for field in ('id', 'name', 'total_marks'):
+        if not test.get(field):
+            problems.append(f"missing {field}")
+    questions = test.get('questions')
+    if not questions:
+        return problems + ["no questions"]
+
+    total = 0
+    for i, question in enumerate(questions, start=1):
+        q_type = question.get('type')
+        if q_type not in QUESTION_TYPES:
+            problems.append(f"Q{i}: unknown type {q_type!r}")
+        if not question.get('question'):
+            problems.append(f"Q{i}: missing question text")
+        marks = question.get('marks')
+        if not isinstance(marks, (int, float)) or marks <= 0:
+            problems.append(f"Q{i}: marks must be a positive number")
+        else:
+            total += marks
+        if q_type in CHOICE_TYPES:
+            options = question.get('options') or []
+            if len(options) < 2:
+                problems.append(f"Q{i}: needs at least two options")
+            elif question.get('correct_answer') not in options:
+                problems.append(f"Q{i}: correct answer is not one of the options")
+        elif not question.get('correct_answer'):
+            problems.append(f"Q{i}: missing model answer")
+
+    if test.get('total_marks') and total != test['total_marks']:
+        problems.append(f"question marks add up to {total}, not {test['total_marks']}")
+    return problems
+
+
+def freeze(value):
+    """Read-only copy of a parsed JSON value"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class ParsedTestCache:
+    def __init__(self, repository=None):
+        self._repository = repository
+        self._tests = {}
+        # Bumped on invalidation so a load that raced with a save is not kept
+        self._generations = defaultdict(int)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def repository(self):
+        return self._repository or get_repository()
+
+    def get(self, test_id):
+        """Return the frozen test, or None if it does not exist
+
+        Raises InvalidTestError if the stored test fails validation.
+        """
+        with self._lock:
+            test = self._tests.get(test_id)
+            if test is not None:
+                self.hits += 1
+                return test
+            self.misses += 1
+            generation = self._generations[test_id]
+        raw = self.repository.get_test(test_id)
+        if raw is None:
+            return None
+        problems = validate_test(raw)
+        if problems:
+            raise InvalidTestError(test_id, problems)
+        test = freeze(raw)
+        with self._lock:
+            if generation != self._generations[test_id]:
+                return test
+            # Keep whichever copy got here first so every session shares one
+            return self._tests.setdefault(test_id, test)
+
+    def invalidate(self, test_id=None):
+        """Drop one test, or every test, from the cache"""
+        with self._lock:
+            if test_id is None:
+                self._tests.clear()
+                for key in self._generations:
+                    self._generations[key] += 1
+            else:
+                self._tests.pop(test_id, None)
+                self._generations[test_id] += 1
+
+
+parsed_tests = ParsedTestCache()
+on_test_saved(lambda test: parsed_tests.invalidate(test['id']))
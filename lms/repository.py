@@ -0,0 +1,211 @@
+"""Storage backends for users, tests, submissions, notes and grades.
+
+Pages call :func:`get_repository` instead of opening JSON files directly. The
+backend is chosen with ``LMS_STORAGE_BACKEND``: ``json`` (default) keeps the
+original flat files, ``sqlite`` uses indexed tables in ``lms.db``.
+"""
+import threading
+
+from lms.cache import json_cache
+from lms.config import STORAGE_BACKEND, data_path
+from lms.journal import submission_journal
+from lms.writer import get_writer
+
+USER_CATEGORIES = ('professors', 'students')
+
+
+def user_category(user_type):
+    """Map the 'Professor'/'Student' selector value to its users.json section"""
+    return 'professors' if user_type == 'Professor' else 'students'
+
+
+def load_json(name, default):
+    """Read a JSON data file through the shared cache
+
+    Returns default when the file is missing or empty. The result is shared
+    with other sessions, so copy it before mutating.
+    """
+    return json_cache.load(data_path(name), default)
+
+
+def save_json(name, data):
+    """Replace a JSON data file and wait until it is written"""
+    get_writer(data_path(name)).replace(data).result()
+
+
+def update_json(name, default, mutation):
+    """Queue mutation(data) on the file's group-commit writer; returns a Future"""
+    return get_writer(data_path(name)).submit(mutation, default)
+
+
+# Callbacks run with each test saved through add_test
+_test_listeners = []
+
+
+def on_test_saved(callback):
+    """Register callback(test) to run after a test is saved"""
+    _test_listeners.append(callback)
+
+
+def notify_test_saved(test):
+    for callback in _test_listeners:
+        callback(test)
+
+
+CATALOG_FIELDS = ('id', 'name', 'subject', 'duration', 'total_marks', 'created_by', 'created_at')
+
+
+def catalog_entry(test):
+    """Summary of a test without its questions, as listed in test_catalog.json"""
+    entry = {field: test.get(field) for field in CATALOG_FIELDS}
+    entry['question_count'] = len(test.get('questions', []))
+    return entry
+
+
+def _add_user(users, category, username, record):
+    records = users.setdefault(category, {})
+    if username in records:
+        return False
+    records[username] = record
+    return True
+
+
+def _upsert_by_id(records, new_records):
+    """Replace records with a matching id in place and append the rest"""
+    positions = {record.get('id'): i for i, record in enumerate(records)}
+    for record in new_records:
+        i = positions.get(record.get('id'))
+        if i is None:
+            positions[record.get('id')] = len(records)
+            records.append(record)
+        else:
+            records[i] = record
+
+
+def _set_last_logins(users, updates):
+    for (category, username), timestamp in updates.items():
+        record = users.get(category, {}).get(username)
+        if record is not None:
+            record['last_login'] = timestamp
+
+
+class JsonRepository:
+    """Backend over the original users/tests/notes/grades JSON files
+
+    Reads come from the shared JSON cache, so returned records must not be
+    mutated in place. Writes are queued on each file's group-commit writer.
+    """
+
+    # Users
+    def load_users(self):
+        users = load_json('users.json', {})
+        return {category: dict(users.get(category, {})) for category in USER_CATEGORIES}
+
+    def get_user(self, category, username):
+        return self.load_users()[category].get(username)
+
+    def add_user(self, category, username, record):
+        return update_json('users.json', {},
+                           lambda users: _add_user(users, category, username, record)).result()
+
+    def set_last_logins(self, updates):
+        """Apply {(category, username): timestamp} in one write"""
+        if not updates:
+            return
+        updates = dict(updates)
+        update_json('users.json', {}, lambda users: _set_last_logins(users, updates)).result()
+
+    # Tests
+    def list_tests(self, subject=None):
+        tests = load_json('tests.json', [])
+        if subject is not None:
+            tests = [test for test in tests if test.get('subject') == subject]
+        return tests
+
+    def get_test(self, test_id):
+        for test in load_json('tests.json', []):
+            if test['id'] == test_id:
+                return test
+        return None
+
+    def list_test_catalog(self, subject=None):
+        """Test summaries without questions; see catalog_entry"""
+        catalog = load_json('test_catalog.json', None)
+        if catalog is None:
+            # Built once from tests.json, then kept current by add_test
+            catalog = [catalog_entry(test) for test in load_json('tests.json', [])]
+            save_json('test_catalog.json', catalog)
+        if subject is not None:
+            catalog = [entry for entry in catalog if entry.get('subject') == subject]
+        return catalog
+
+    def add_test(self, test):
+        self.add_tests([test])
+
+    def add_tests(self, tests):
+        """Save several tests with one write per file, replacing any with the same id"""
+        tests = list(tests)
+        if not tests:
+            return
+        update_json('tests.json', [], lambda stored: _upsert_by_id(stored, tests)).result()
+        if load_json('test_catalog.json', None) is None:
+            self.list_test_catalog()
+        else:
+            entries = [catalog_entry(test) for test in tests]
+            update_json('test_catalog.json', [],
+                        lambda catalog: _upsert_by_id(catalog, entries)).result()
+        for test in tests:
+            notify_test_saved(test)
+
+    # Submissions
+    def iter_submissions(self, student=None, test_id=None):
+        return submission_journal.iter_submissions(student=student, test_id=test_id)
+
+    def list_submissions(self, student=None, test_id=None):
+        return list(self.iter_submissions(student=student, test_id=test_id))
+
+    def add_submission(self, submission):
+        submission_journal.append(submission)
+
+    def update_submissions(self, submissions):
+        """Insert or replace submissions by id"""
+        submission_journal.append_many(submissions)
+
+    # Notes
+    def list_notes(self):
+        return load_json('notes.json', [])
+
+    def add_note(self, note):
+        update_json('notes.json', [], lambda notes: notes.append(note)).result()
+
+    def replace_notes(self, notes):
+        save_json('notes.json', notes)
+
+    # Grades
+    def list_grades(self, student=None):
+        grades = load_json('grades.json', [])
+        if student is not None:
+            grades = [grade for grade in grades if grade.get('student') == student]
+        return grades
+
+    def add_grade(self, grade):
+        update_json('grades.json', [], lambda grades: grades.append(grade)).result()
+
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_repository():
+    """Return the process-wide repository for the configured backend"""
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            if STORAGE_BACKEND == 'sqlite':
+                from lms.sqlite_store import SqliteRepository
+                _repository = SqliteRepository()
+            elif STORAGE_BACKEND == 'json':
+                _repository = JsonRepository()
+            else:
+                raise ValueError(f"Unknown storage backend: {STORAGE_BACKEND}")
+        return _repository
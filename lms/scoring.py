@@ -0,0 +1,107 @@
+"""Keyword scoring for short-answer questions.
+
+A model answer is compiled once into a matcher. The matcher scans a student
+answer a single time, however many keywords the model answer has. Two modes:
+
+* ``substring`` (default) matches the original grader exactly: a keyword
+  counts if it occurs anywhere in the lowercased answer. Matching uses an
+  Aho-Corasick automaton.
+* ``token`` splits both texts into words and intersects the sets, so
+  "model." matches "model" but "age" no longer matches inside "language".
+
+Duplicate keywords in the model answer count once per occurrence, as before.
+An empty model answer scores 0 instead of dividing by zero.
+"""
+import re
+from collections import Counter
+from functools import lru_cache
+
+from lms.config import KEYWORD_MATCH_MODE
+
+WORD_RE = re.compile(r'\w+')
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher"""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] += (pattern_id,)
+
+        # Breadth-first pass to fill in failure links
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(ch, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def find_all(self, text):
+        """Return the set of pattern ids that occur in text"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        remaining = len(self.patterns)
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+                if len(found) == remaining:
+                    break
+        return found
+
+
+class KeywordMatcher:
+    def __init__(self, model_answer, mode=KEYWORD_MATCH_MODE):
+        if mode not in ('substring', 'token'):
+            raise ValueError(f"Unknown keyword match mode: {mode}")
+        self.mode = mode
+        if mode == 'substring':
+            keywords = model_answer.lower().split()
+        else:
+            keywords = WORD_RE.findall(model_answer.lower())
+        self.total = len(keywords)
+        # Patterns are matched once, each weighted by how often it appears
+        self.weights = Counter(keywords)
+        self.keywords = list(self.weights)
+        self._automaton = AhoCorasick(self.keywords) if mode == 'substring' else None
+
+    def matches(self, answer):
+        """Number of model-answer keywords found in answer"""
+        answer = answer.lower()
+        if self._automaton is not None:
+            found = self._automaton.find_all(answer)
+            return sum(self.weights[self.keywords[i]] for i in found)
+        tokens = self.weights.keys() & set(WORD_RE.findall(answer))
+        return sum(self.weights[token] for token in tokens)
+
+    def accuracy(self, answer):
+        """Fraction of keywords matched, 0 for an empty model answer"""
+        if not self.total:
+            return 0
+        return self.matches(answer) / self.total
+
+
+@lru_cache(maxsize=4096)
+def get_matcher(model_answer, mode=KEYWORD_MATCH_MODE):
+    """Compiled matcher for a model answer, shared by every question that uses it"""
+    return KeywordMatcher(model_answer, mode)
@@ -0,0 +1,298 @@
+"""SQLite backend with indexed tables for the repository interface.
+
+Each record is stored as its original JSON document plus the columns we look
+it up by, so pages receive the same dicts as with the JSON backend. Run
+``python -m lms.sqlite_store`` once to copy the existing JSON files into
+``lms.db``, then start the app with ``LMS_STORAGE_BACKEND=sqlite``.
+"""
+import json
+import sqlite3
+import sys
+import threading
+
+from lms.config import SQLITE_PATH
+from lms.journal import submission_journal
+from lms.repository import (CATALOG_FIELDS, USER_CATEGORIES, catalog_entry, load_json,
+                            notify_test_saved)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    category TEXT NOT NULL,
+    username TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (category, username)
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    subject TEXT,
+    created_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tests_subject ON tests (subject);
+CREATE TABLE IF NOT EXISTS test_catalog (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    subject TEXT,
+    duration INTEGER,
+    total_marks INTEGER,
+    created_by TEXT,
+    created_at TEXT,
+    question_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_test_catalog_subject ON test_catalog (subject);
+CREATE TABLE IF NOT EXISTS submissions (
+    id TEXT PRIMARY KEY,
+    student TEXT,
+    test_id TEXT,
+    date TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_submissions_student ON submissions (student, date);
+CREATE INDEX IF NOT EXISTS idx_submissions_test ON submissions (test_id, date);
+CREATE INDEX IF NOT EXISTS idx_submissions_date ON submissions (date);
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT,
+    date TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS grades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student TEXT,
+    subject TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_grades_student ON grades (student);
+"""
+
+UPSERT_SUBMISSION = """
+INSERT INTO submissions (id, student, test_id, date, data) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    student = excluded.student, test_id = excluded.test_id,
+    date = excluded.date, data = excluded.data
+"""
+
+UPSERT_TEST = """
+INSERT INTO tests (id, name, subject, created_at, data) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    name = excluded.name, subject = excluded.subject,
+    created_at = excluded.created_at, data = excluded.data
+"""
+
+
+UPSERT_CATALOG = """
+INSERT OR REPLACE INTO test_catalog
+    (id, name, subject, duration, total_marks, created_by, created_at, question_count)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Fills catalog rows for tests stored before the catalog table existed
+BACKFILL_CATALOG = """
+INSERT OR IGNORE INTO test_catalog
+SELECT id, name, subject, json_extract(data, '$.duration'), json_extract(data, '$.total_marks'),
+       json_extract(data, '$.created_by'), created_at, json_array_length(data, '$.questions')
+FROM tests WHERE id NOT IN (SELECT id FROM test_catalog)
+"""
+
+
+def _submission_row(sub):
+    return (sub.get('id'), sub.get('student'), sub.get('test_id'), sub.get('date'), json.dumps(sub))
+
+
+def _test_row(test):
+    return (test['id'], test.get('name'), test.get('subject'), test.get('created_at'), json.dumps(test))
+
+
+def _catalog_row(test):
+    entry = catalog_entry(test)
+    return tuple(entry[field] for field in CATALOG_FIELDS) + (entry['question_count'],)
+
+
+class SqliteRepository:
+    """Backend storing every collection in one SQLite database"""
+
+    def __init__(self, path=None):
+        self.path = str(path or SQLITE_PATH)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            conn.execute(BACKFILL_CATALOG)
+
+    def _connect(self):
+        # sqlite3 connections can't be shared across Streamlit's script threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _select_data(self, query, params=()):
+        rows = self._connect().execute(query, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    # Users
+    def load_users(self):
+        users = {category: {} for category in USER_CATEGORIES}
+        for category, username, data in self._connect().execute(
+                'SELECT category, username, data FROM users'):
+            users.setdefault(category, {})[username] = json.loads(data)
+        return users
+
+    def get_user(self, category, username):
+        row = self._connect().execute(
+            'SELECT data FROM users WHERE category = ? AND username = ?',
+            (category, username)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def add_user(self, category, username, record):
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO users (category, username, data) VALUES (?, ?, ?)',
+                (category, username, json.dumps(record)))
+        return cursor.rowcount == 1
+
+    def set_last_logins(self, updates):
+        """Apply {(category, username): timestamp} in one transaction"""
+        if not updates:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE users SET data = json_set(data, '$.last_login', ?) "
+                "WHERE category = ? AND username = ?",
+                [(timestamp, category, username)
+                 for (category, username), timestamp in updates.items()])
+
+    # Tests
+    def list_tests(self, subject=None):
+        if subject is None:
+            return self._select_data('SELECT data FROM tests ORDER BY rowid')
+        return self._select_data(
+            'SELECT data FROM tests WHERE subject = ? ORDER BY rowid', (subject,))
+
+    def get_test(self, test_id):
+        rows = self._select_data('SELECT data FROM tests WHERE id = ?', (test_id,))
+        return rows[0] if rows else None
+
+    def list_test_catalog(self, subject=None):
+        """Test summaries without questions, read from the test_catalog table"""
+        query = f"SELECT {', '.join(CATALOG_FIELDS)}, question_count FROM test_catalog"
+        params = ()
+        if subject is not None:
+            query += ' WHERE subject = ?'
+            params = (subject,)
+        cursor = self._connect().execute(query + ' ORDER BY rowid', params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def add_test(self, test):
+        self.add_tests([test])
+
+    def add_tests(self, tests):
+        """Save several tests in one transaction"""
+        tests = list(tests)
+        with self._connect() as conn:
+            conn.executemany(UPSERT_TEST, [_test_row(test) for test in tests])
+            conn.executemany(UPSERT_CATALOG, [_catalog_row(test) for test in tests])
+        for test in tests:
+            notify_test_saved(test)
+
+    # Submissions
+    def iter_submissions(self, student=None, test_id=None):
+        clauses, params = [], []
+        if student is not None:
+            clauses.append('student = ?')
+            params.append(student)
+        if test_id is not None:
+            clauses.append('test_id = ?')
+            params.append(test_id)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        cursor = self._connect().execute(
+            f'SELECT data FROM submissions{where} ORDER BY rowid', params)
+        for (data,) in cursor:
+            yield json.loads(data)
+
+    def list_submissions(self, student=None, test_id=None):
+        return list(self.iter_submissions(student=student, test_id=test_id))
+
+    def add_submission(self, submission):
+        self.update_submissions([submission])
+
+    def update_submissions(self, submissions):
+        """Insert or replace submissions by id"""
+        with self._connect() as conn:
+            conn.executemany(UPSERT_SUBMISSION, [_submission_row(sub) for sub in submissions])
+
+    # Notes
+    def list_notes(self):
+        return self._select_data('SELECT data FROM notes ORDER BY id')
+
+    def add_note(self, note):
+        with self._connect() as conn:
+            conn.execute('INSERT INTO notes (title, date, data) VALUES (?, ?, ?)',
+                         (note.get('title'), note.get('date'), json.dumps(note)))
+
+    def replace_notes(self, notes):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM notes')
+            conn.executemany('INSERT INTO notes (title, date, data) VALUES (?, ?, ?)',
+                             [(note.get('title'), note.get('date'), json.dumps(note))
+                              for note in notes])
+
+    # Grades
+    def list_grades(self, student=None):
+        if student is None:
+            return self._select_data('SELECT data FROM grades ORDER BY id')
+        return self._select_data(
+            'SELECT data FROM grades WHERE student = ? ORDER BY id', (student,))
+
+    def add_grade(self, grade):
+        with self._connect() as conn:
+            conn.execute('INSERT INTO grades (student, subject, data) VALUES (?, ?, ?)',
+                         (grade.get('student'), grade.get('subject'), json.dumps(grade)))
+
+
+def migrate_from_json(repo=None):
+    """Copy the JSON data files into SQLite; safe to re-run
+
+    Returns the number of records copied per table.
+    """
+    repo = repo or SqliteRepository()
+    users = load_json('users.json', {})
+    tests = load_json('tests.json', [])
+    submissions = submission_journal.load()
+    notes = load_json('notes.json', [])
+    grades = load_json('grades.json', [])
+
+    with repo._connect() as conn:
+        conn.executemany(
+            'INSERT OR REPLACE INTO users (category, username, data) VALUES (?, ?, ?)',
+            [(category, username, json.dumps(record))
+             for category in USER_CATEGORIES
+             for username, record in users.get(category, {}).items()])
+        conn.executemany(UPSERT_TEST, [_test_row(test) for test in tests])
+        conn.executemany(UPSERT_CATALOG, [_catalog_row(test) for test in tests])
+        conn.executemany(UPSERT_SUBMISSION, [_submission_row(sub) for sub in submissions])
+        # Grades have no natural key, so replace them wholesale
+        conn.execute('DELETE FROM grades')
+        conn.executemany('INSERT INTO grades (student, subject, data) VALUES (?, ?, ?)',
+                         [(grade.get('student'), grade.get('subject'), json.dumps(grade))
+                          for grade in grades])
+    repo.replace_notes(notes)
+
+    return {
+        'users': sum(len(users.get(category, {})) for category in USER_CATEGORIES),
+        'tests': len(tests),
+        'submissions': len(submissions),
+        'notes': len(notes),
+        'grades': len(grades),
+    }
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else None
+    counts = migrate_from_json(SqliteRepository(target))
+    for table, count in counts.items():
+        print(f"{table}: {count} records")
@@ -0,0 +1,162 @@
+"""Incrementally maintained class statistics.
+
+Each graded submission adds its percentage score to a ScoreSketch for its test
+and to one for the whole class. A sketch keeps a running count, sum and sum of
+squares, giving mean and standard deviation, and a fixed-width histogram that
+answers percentile queries. Sketches merge by addition, so the statistics page
+reads a few small records from class_stats.json regardless of how many
+submissions there are. rebuild() recomputes everything from the submissions
+and bumps a generation number in the file; a record() queued before the
+rebuild carries the old generation and is dropped, since the rebuild already
+counted it.
+"""
+import math
+
+from lms.cache import json_cache
+from lms.config import data_path
+from lms.writer import get_writer
+
+# Histogram resolution in percentage points; scores are clamped to 0-100
+BIN_WIDTH = 0.5
+NUM_BINS = int(100 / BIN_WIDTH) + 1
+
+
+def submission_percentage(submission):
+    """Percentage score of a graded submission, or None if it has no marks"""
+    total = submission.get('total_marks')
+    if not submission.get('evaluated') or not total:
+        return None
+    return submission['score'] / total * 100
+
+
+class ScoreSketch:
+    def __init__(self, count=0, total=0.0, total_sq=0.0, minimum=None, maximum=None, bins=None):
+        self.count = count
+        self.total = total
+        self.total_sq = total_sq
+        self.minimum = minimum
+        self.maximum = maximum
+        self.bins = list(bins) if bins else [0] * NUM_BINS
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.bins[min(max(int(value / BIN_WIDTH), 0), NUM_BINS - 1)] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        for attr, pick in (('minimum', min), ('maximum', max)):
+            values = [v for v in (getattr(self, attr), getattr(other, attr)) if v is not None]
+            setattr(self, attr, pick(values) if values else None)
+        self.bins = [a + b for a, b in zip(self.bins, other.bins)]
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        """Population standard deviation"""
+        if not self.count:
+            return 0.0
+        return math.sqrt(max(self.total_sq / self.count - self.mean ** 2, 0.0))
+
+    def percentile(self, q):
+        """Approximate q-th percentile (0-100), accurate to BIN_WIDTH"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.bins):
+            if n and seen + n >= rank:
+                # Interpolate inside the bin, then keep within observed bounds
+                value = (i + (rank - seen) / n) * BIN_WIDTH
+                return min(max(value, self.minimum), self.maximum)
+            seen += n
+        return self.maximum
+
+    def to_dict(self):
+        return {'count': self.count, 'total': self.total, 'total_sq': self.total_sq,
+                'minimum': self.minimum, 'maximum': self.maximum, 'bins': self.bins}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['count'], data['total'], data['total_sq'],
+                   data['minimum'], data['maximum'], data['bins'])
+
+
+class ClassStatsStore:
+    def __init__(self, path=None):
+        self.path = str(path or data_path('class_stats.json'))
+
+    def load(self):
+        """Return {'overall': sketch, 'tests': {test_id: (name, sketch)}}, or None if never built"""
+        data = json_cache.load(self.path)
+        if data is None:
+            return None
+        return {
+            'overall': ScoreSketch.from_dict(data['overall']),
+            'tests': {test_id: (entry['name'], ScoreSketch.from_dict(entry['sketch']))
+                      for test_id, entry in data['tests'].items()},
+        }
+
+    def record(self, submissions):
+        """Add newly graded submissions; returns a Future for the write"""
+        submissions = [sub for sub in submissions if submission_percentage(sub) is not None]
+        if not submissions:
+            return None
+        generation = self._generation()
+
+        def apply(data):
+            if data.get('generation', 0) == generation:
+                self._apply(data, submissions)
+
+        return get_writer(self.path).submit(apply, self._empty())
+
+    def rebuild(self, submissions):
+        """Recompute all statistics from scratch and return them"""
+        rebuilt = self._empty()
+        self._apply(rebuilt, [sub for sub in submissions if submission_percentage(sub) is not None])
+
+        def replace(data):
+            rebuilt['generation'] = data.get('generation', 0) + 1
+            data.clear()
+            data.update(rebuilt)
+
+        get_writer(self.path).submit(replace, self._empty()).result()
+        return self.load()
+
+    def _generation(self):
+        data = json_cache.load(self.path)
+        return data.get('generation', 0) if data else 0
+
+    @staticmethod
+    def _empty():
+        return {'overall': ScoreSketch().to_dict(), 'tests': {}, 'generation': 0}
+
+    @staticmethod
+    def _apply(data, submissions):
+        overall = ScoreSketch.from_dict(data['overall'])
+        data.pop('graded_ids', None)  # Written by older versions; no longer used
+        tests = {}
+        for sub in submissions:
+            test_id = sub['test_id']
+            if test_id not in tests:
+                entry = data['tests'].get(test_id)
+                tests[test_id] = ScoreSketch.from_dict(entry['sketch']) if entry else ScoreSketch()
+            value = submission_percentage(sub)
+            overall.add(value)
+            tests[test_id].add(value)
+            data['tests'][test_id] = {'name': sub.get('test_name', test_id), 'sketch': None}
+        data['overall'] = overall.to_dict()
+        for test_id, sketch in tests.items():
+            data['tests'][test_id]['sketch'] = sketch.to_dict()
+
+
+class_stats = ClassStatsStore()
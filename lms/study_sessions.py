@@ -0,0 +1,104 @@
+"""Per-user, append-only storage for self-study session reports.
+
+Each student gets their own ``study_sessions/<username>.jsonl``. Saving a
+session appends one line to that file, and the history view reads only that
+file, so neither depends on how many other students have recorded sessions.
+Sessions still in the old shared ``study_sessions.json`` are read as well.
+``python -m lms.study_sessions`` moves them into the per-user files.
+"""
+import json
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime
+from urllib.parse import quote, unquote
+
+from lms.cache import json_cache
+from lms.config import data_path
+from lms.jsonl import iter_jsonl
+
+LEGACY_FILE = 'study_sessions.json'
+
+
+class StudySessionStore:
+    def __init__(self, root=None, legacy_path=None):
+        self.root = root or data_path('study_sessions')
+        self.legacy_path = legacy_path or data_path(LEGACY_FILE)
+        self._locks = defaultdict(threading.Lock)
+        self._locks_lock = threading.Lock()
+
+    def path(self, username):
+        return os.path.join(self.root, f"{quote(username, safe='')}.jsonl")
+
+    def append(self, username, report, timestamp=None):
+        """Record one session for username with a single append"""
+        session = {
+            'timestamp': timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'report': report
+        }
+        self._append_lines(username, [session])
+        return session
+
+    def load(self, username):
+        """Return username's sessions, oldest first"""
+        sessions = list(json_cache.load(self.legacy_path, {}).get(username, []))
+        sessions.extend(iter_jsonl(self.path(username)))
+        return sessions
+
+    def usernames(self):
+        """Every user with recorded sessions"""
+        names = set(json_cache.load(self.legacy_path, {}))
+        if os.path.isdir(self.root):
+            names.update(unquote(name[:-len('.jsonl')])
+                         for name in os.listdir(self.root) if name.endswith('.jsonl'))
+        return sorted(names)
+
+    def iter_all(self):
+        """Yield (username, session) for every recorded session"""
+        for username in self.usernames():
+            for session in self.load(username):
+                yield username, session
+
+    def migrate_legacy(self):
+        """Move sessions from study_sessions.json into per-user files
+
+        Returns the number of sessions moved. The old file is renamed to
+        study_sessions.json.migrated so nothing is counted twice.
+        """
+        legacy = json_cache.load(self.legacy_path, {})
+        moved = 0
+        for username, sessions in legacy.items():
+            if sessions:
+                self._append_lines(username, sessions, prepend=True)
+                moved += len(sessions)
+        if os.path.exists(self.legacy_path):
+            os.replace(self.legacy_path, f"{self.legacy_path}.migrated")
+            json_cache.invalidate(self.legacy_path)
+        return moved
+
+    def _lock_for(self, username):
+        with self._locks_lock:
+            return self._locks[username]
+
+    def _append_lines(self, username, sessions, prepend=False):
+        os.makedirs(self.root, exist_ok=True)
+        payload = ''.join(json.dumps(session) + '\n' for session in sessions)
+        path = self.path(username)
+        with self._lock_for(username):
+            if prepend and os.path.exists(path):
+                with open(path, 'r') as f:
+                    payload += f.read()
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+                return
+            with open(path, 'w' if prepend else 'a') as f:
+                f.write(payload)
+
+
+study_sessions = StudySessionStore()
+
+
+if __name__ == "__main__":
+    print(f"Moved {study_sessions.migrate_legacy()} sessions into {study_sessions.root}")
@@ -0,0 +1,99 @@
+"""In-memory user directory with batched last_login writes.
+
+Logins are answered from a dict keyed by (category, username), so they never
+reload users.json. The last_login stamps are queued and a background thread
+writes them in one batch per flush interval. A burst of logins therefore
+costs at most one write every few seconds.
+"""
+import atexit
+import threading
+from datetime import datetime
+
+from lms.flusher import PeriodicFlusher
+from lms.repository import get_repository
+
+# Seconds between last_login flushes
+FLUSH_INTERVAL = 5.0
+
+
+class UserDirectory:
+    def __init__(self, repository=None, flush_interval=FLUSH_INTERVAL):
+        self._repository = repository
+        self.flush_interval = flush_interval
+        self._users = None
+        self._pending_logins = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher = PeriodicFlusher(self.flush, flush_interval, 'user-directory-flusher')
+
+    @property
+    def repository(self):
+        return self._repository or get_repository()
+
+    def _index(self):
+        if self._users is None:
+            users = self.repository.load_users()
+            self._users = {
+                (category, username): dict(record)
+                for category, records in users.items()
+                for username, record in records.items()
+            }
+        return self._users
+
+    def get(self, category, username):
+        """Return the user record, or None if no such user exists"""
+        key = (category, username)
+        with self._lock:
+            record = self._index().get(key)
+        if record is None:
+            # May have been registered by another process since we loaded
+            record = self.repository.get_user(category, username)
+            if record is not None:
+                record = dict(record)
+                with self._lock:
+                    self._index()[key] = record
+        return record
+
+    def register(self, category, username, record):
+        """Store a new user; returns False if the username is taken"""
+        if self.get(category, username) is not None:
+            return False
+        if not self.repository.add_user(category, username, record):
+            return False
+        with self._lock:
+            self._index()[(category, username)] = record
+        return True
+
+    def record_login(self, category, username, timestamp=None):
+        """Stamp last_login in memory and queue it for the next flush"""
+        timestamp = timestamp or datetime.now().isoformat()
+        key = (category, username)
+        with self._lock:
+            record = self._index().get(key)
+            if record is not None:
+                record['last_login'] = timestamp
+            self._pending_logins[key] = timestamp
+        self._flusher.ensure_started()
+
+    def flush(self):
+        """Write all queued last_login stamps in one batch"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending_logins = self._pending_logins, {}
+            if pending:
+                try:
+                    self.repository.set_last_logins(pending)
+                except Exception:
+                    # Keep the stamps for the next attempt unless newer ones arrived
+                    with self._lock:
+                        for key, timestamp in pending.items():
+                            self._pending_logins.setdefault(key, timestamp)
+                    raise
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending_logins)
+
+
+user_directory = UserDirectory()
+atexit.register(user_directory.flush)
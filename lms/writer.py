@@ -0,0 +1,158 @@
+"""Group-commit writers for the JSON data files.
+
+Every JSON file gets a single background writer thread. Callers submit a
+mutation, a function that edits the parsed data in place, and receive a
+Future. At most once per flush interval the writer applies every pending
+mutation in order to a fresh copy of the file and writes it once
+(temp file + rename). Concurrent saves from many sessions therefore
+coalesce into one write instead of racing to overwrite each other.
+
+Each mutation carries its own default, used when the file is missing or
+empty, so the result does not depend on which caller created the writer.
+"""
+import atexit
+import copy
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+from lms.cache import json_cache
+from lms.config import WRITE_FLUSH_INTERVAL
+
+
+class _Replace:
+    def __init__(self, data):
+        self.data = data
+
+
+class GroupCommitWriter:
+    def __init__(self, path, flush_interval=WRITE_FLUSH_INTERVAL):
+        self.path = str(path)
+        self.flush_interval = flush_interval
+        self.flushes = 0
+        self.mutations = 0
+        self._pending = []
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=f"writer-{os.path.basename(self.path)}")
+        self._thread.start()
+
+    def submit(self, mutation, default=None):
+        """Queue mutation(data); the Future resolves to its return value once written
+
+        data is a copy of default when the file is missing or empty.
+        """
+        future = Future()
+        with self._cond:
+            self._pending.append((mutation, default, future))
+            self._cond.notify()
+        return future
+
+    def replace(self, data):
+        """Queue a wholesale replacement of the file contents"""
+        return self.submit(_Replace(copy.deepcopy(data)))
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been written"""
+        with self._cond:
+            if not self._pending:
+                return
+        self.submit(lambda data: None).result(timeout)
+
+    def pending_count(self):
+        with self._cond:
+            return len(self._pending)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+            # Give concurrent sessions a moment to join this batch
+            time.sleep(self.flush_interval)
+            with self._cond:
+                batch, self._pending = self._pending, []
+            self._commit(batch)
+
+    def _commit(self, batch):
+        batch = [(mutation, default, future) for mutation, default, future in batch
+                 if future.set_running_or_notify_cancel()]
+        try:
+            data = self._read()
+        except Exception as e:
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        outcomes = []
+        for mutation, default, future in batch:
+            try:
+                if isinstance(mutation, _Replace):
+                    data, result = mutation.data, None
+                else:
+                    if data is None:
+                        data = copy.deepcopy(default)
+                    result = mutation(data)
+                outcomes.append((future, result, None))
+            except Exception as e:
+                outcomes.append((future, None, e))
+
+        try:
+            if data is not None:
+                self._write(data)
+        except Exception as e:
+            for future, _, _ in outcomes:
+                future.set_exception(e)
+            return
+
+        self.flushes += 1
+        self.mutations += len(outcomes)
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        if not content:
+            return None
+        return json.loads(content)
+
+    def _write(self, data):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        json_cache.invalidate(self.path)
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(path):
+    """Return the process-wide writer for a JSON file"""
+    path = os.path.abspath(path)
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None:
+            writer = _writers[path] = GroupCommitWriter(path)
+        return writer
+
+
+@atexit.register
+def flush_all(timeout=5):
+    """Drain every writer; registered to run at interpreter exit"""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.flush(timeout)
@@ -1,86 +1,18 @@
 import streamlit as st
-import json
+import tempfile
 from datetime import datetime
-import base64
-import os
+from lms.analytics import analytics_exporter, monthly_report, test_report
+from lms.blobs import blob_store
+from lms.bulk import export_gradebook
+from lms.grading_service import grading_service
+from lms.item_analysis import item_analyzer
+from lms.repository import get_repository
+from lms.stats import class_stats
 
 # Check if user is logged in
 if 'logged_in' not in st.session_state or not st.session_state.logged_in:
     st.switch_page("app.py")
 
-def load_content(content_type):
-    """
-    Load content from JSON file with proper error handling
-    """
-    try:
-        # Create file if it doesn't exist
-        if not os.path.exists(f'{content_type}.json'):
-            with open(f'{content_type}.json', 'w') as f:
-                json.dump([], f)
-        
-        with open(f'{content_type}.json', 'r') as f:
-            content = f.read()
-            if not content:
-                return []
-            return json.loads(content)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
-
-def save_content(content_type, data):
-    """
-    Save content to JSON file with error handling
-    """
-    try:
-        with open(f'{content_type}.json', 'w') as f:
-            json.dump(data, f, indent=4)
-    except Exception as e:
-        st.error(f"Error saving data: {str(e)}")
-
-def evaluate_test(submission):
-    """
-    Automatically evaluate test submission by comparing with correct answers
-    Returns: (score, total_marks, feedback)
-    """
-    tests = load_content('tests')
-    test = None
-    
-    # Find the corresponding test
-    for t in tests:
-        if t['id'] == submission['test_id']:
-            test = t
-            break
-    
-    if not test:
-        return 0, 0, "Test not found"
-
-    score = 0
-    feedback = []
-    total_marks = test['total_marks']
-    
-    for i, (question, answer) in enumerate(submission['answers'].items()):
-        q_index = int(question.split('_')[1])
-        correct = test['questions'][q_index]['correct_answer']
-        marks = test['questions'][q_index]['marks']
-        
-        if test['questions'][q_index]['type'] == 'Short Answer':
-            # For short answers, check if key words from correct answer appear in student's answer
-            keywords = correct.lower().split()
-            student_answer = answer.lower()
-            matches = sum(1 for keyword in keywords if keyword in student_answer)
-            accuracy = matches / len(keywords)
-            question_score = marks * accuracy
-            score += question_score
-            feedback.append(f"Q{q_index + 1}: {question_score}/{marks} marks - {accuracy*100:.0f}% keyword match")
-        else:
-            # For MCQ and True/False
-            if answer == correct:
-                score += marks
-                feedback.append(f"Q{q_index + 1}: {marks}/{marks} marks - Correct")
-            else:
-                feedback.append(f"Q{q_index + 1}: 0/{marks} marks - Incorrect. Correct answer: {correct}")
-
-    return score, total_marks, "\n".join(feedback)
-
 def professor_dashboard():
     """
     Main dashboard function for professors
@@ -118,9 +50,9 @@ def professor_dashboard():
         st.switch_page("pages/test_creator.py")
         return
     
-    # Load submissions
-    submissions = load_content('submissions')
-    submissions_list = submissions if isinstance(submissions, list) else list(submissions.values())
+    repo = get_repository()
+    if selection in ("Dashboard", "View Submissions"):
+        submissions_list = repo.list_submissions()
     
     # Dashboard view
     if selection == "Dashboard":
@@ -172,26 +104,22 @@ def professor_dashboard():
                     st.error("Please provide either content or upload a file")
                 else:
                     try:
-                        notes = load_content('notes')
-                        
-                        file_content = None
-                        if file:
-                            try:
-                                file_content = base64.b64encode(file.getvalue()).decode('utf-8')
-                            except Exception as e:
-                                st.error(f"Error processing file: {str(e)}")
-                                return
-                        
                         new_note = {
                             'title': title,
                             'content': content,
-                            'file': file_content,
                             'uploaded_by': st.session_state.username,
                             'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                         }
                         
-                        notes.append(new_note)
-                        save_content('notes', notes)
+                        if file:
+                            try:
+                                new_note['file_ref'] = blob_store.put_file(file)
+                                new_note['file_size'] = file.size
+                            except Exception as e:
+                                st.error(f"Error processing file: {str(e)}")
+                                return
+                        
+                        repo.add_note(new_note)
                         st.success("Study material uploaded successfully!")
                         st.session_state.dashboard_selection = "Dashboard"
                         st.rerun()
@@ -201,19 +129,43 @@ def professor_dashboard():
     # View Submissions view
     elif selection == "View Submissions":
         st.header("View Submissions")
+        # Submissions are graded in the background as they arrive
+        grading_service.start()
+        grading_stats = grading_service.stats()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Grading Queue", grading_stats['queue_depth'])
+        col2.metric("Graded Since Start", grading_stats['processed'])
+        col3.metric("Median Grading Latency", f"{grading_stats['latency_p50']:.2f}s")
+        col4.metric("Grading Throughput", f"{grading_stats['throughput']:.0f}/s",
+                    help=f"{grading_stats['tests_per_batch']:.1f} tests compiled per batch")
+        
+        if st.button("Export Gradebook"):
+            # Rows are streamed to a temporary file rather than built in memory
+            with tempfile.TemporaryFile(mode='w+', newline='') as gradebook:
+                export_gradebook(gradebook, repository=repo)
+                gradebook.seek(0)
+                st.download_button("Download gradebook.csv", gradebook,
+                                   file_name="gradebook.csv", mime="text/csv")
+        
+        pending = [sub for sub in submissions_list if not sub.get('evaluated')]
+        if pending and st.button(f"Grade {len(pending)} pending submissions now"):
+            # The workers already hold these; wait for them rather than grading twice
+            with st.spinner("Grading..."):
+                grading_service.drain()
+            submissions_list = repo.list_submissions()
+        
         if submissions_list:
             for sub in submissions_list:
-                if not sub.get('evaluated'):
-                    score, total_marks, feedback = evaluate_test(sub)
-                    sub['score'] = score
-                    sub['total_marks'] = total_marks
-                    sub['feedback'] = feedback
-                    sub['evaluated'] = True
-                    save_content('submissions', submissions_list)
-                
                 with st.expander(f"Student: {sub['student']} - Test: {sub['test_name']}"):
                     st.write(f"Submitted: {sub['date']}")
-                    st.write(f"Score: {sub['score']}/{sub['total_marks']} ({(sub['score']/sub['total_marks']*100):.1f}%)")
+                    if not sub.get('evaluated'):
+                        st.write("Status: Pending evaluation")
+                        st.write("Detailed Answers:", sub['answers'])
+                        continue
+                    if sub['total_marks']:
+                        st.write(f"Score: {sub['score']}/{sub['total_marks']} ({(sub['score']/sub['total_marks']*100):.1f}%)")
+                    else:
+                        st.write(f"Score: {sub['score']}/{sub['total_marks']}")
                     st.write("Feedback:")
                     st.code(sub['feedback'])
                     st.write("Detailed Answers:", sub['answers'])
@@ -223,37 +175,86 @@ def professor_dashboard():
     # View Statistics view
     elif selection == "View Statistics":
         st.header("Class Statistics")
-        if submissions_list:
-            evaluated_subs = [sub for sub in submissions_list if sub.get('evaluated')]
-            if evaluated_subs:
-                # Calculate overall statistics
-                avg_score = sum(sub['score']/sub['total_marks']*100 for sub in evaluated_subs) / len(evaluated_subs)
-                st.metric("Class Average Score", f"{avg_score:.1f}%")
-                
-                # Test-wise statistics
-                st.subheader("Test-wise Performance")
-                test_stats = {}
-                for sub in evaluated_subs:
-                    test_name = sub['test_name']
-                    if test_name not in test_stats:
-                        test_stats[test_name] = []
-                    test_stats[test_name].append(sub['score']/sub['total_marks']*100)
-                
-                # Display test-wise averages
-                col1, col2 = st.columns(2)
-                for i, (test, scores) in enumerate(test_stats.items()):
-                    avg = sum(scores) / len(scores)
-                    with col1 if i % 2 == 0 else col2:
-                        st.metric(f"{test} Average", f"{avg:.1f}%")
-                
-                # Show participation statistics
-                st.subheader("Participation Statistics")
-                st.metric("Total Submissions", len(evaluated_subs))
-                st.metric("Number of Tests", len(test_stats))
+        # Maintained incrementally as submissions are graded
+        stats = class_stats.load()
+        if stats is None or st.button("Rebuild Statistics"):
+            stats = class_stats.rebuild(repo.iter_submissions())
+        
+        overall = stats['overall']
+        if overall.count:
+            # Calculate overall statistics
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Class Average Score", f"{overall.mean:.1f}%")
+            col2.metric("Standard Deviation", f"{overall.std:.1f}")
+            col3.metric("Median Score", f"{overall.percentile(50):.1f}%")
+            st.caption(f"25th percentile: {overall.percentile(25):.1f}% · "
+                       f"75th percentile: {overall.percentile(75):.1f}% · "
+                       f"90th percentile: {overall.percentile(90):.1f}%")
+            
+            # Test-wise statistics
+            st.subheader("Test-wise Performance")
+            col1, col2 = st.columns(2)
+            for i, (test, sketch) in enumerate(stats['tests'].values()):
+                with col1 if i % 2 == 0 else col2:
+                    st.metric(f"{test} Average", f"{sketch.mean:.1f}%")
+                    st.caption(f"σ {sketch.std:.1f} · median {sketch.percentile(50):.1f}% · "
+                               f"{sketch.count} submissions")
+            
+            # Show participation statistics
+            st.subheader("Participation Statistics")
+            st.metric("Total Submissions", overall.count)
+            st.metric("Number of Tests", len(stats['tests']))
+        else:
+            st.info("No evaluated submissions available")
+        
+        # Per-question item analysis
+        st.subheader("Item Analysis")
+        tests = repo.list_test_catalog()
+        if tests:
+            entry = st.selectbox("Test", tests, format_func=lambda t: t['name'])
+            test = repo.get_test(entry['id'])
+            analysis = item_analyzer.get(entry['id'])
+            if analysis and analysis.submissions:
+                st.caption(f"{analysis.submissions} graded submissions · "
+                           f"mean score {analysis.mean_score:.1f}/{test['total_marks']}")
+                rows = []
+                for i, question in enumerate(test['questions']):
+                    distractors = analysis.distractors[i]
+                    rows.append({
+                        'Question': f"Q{i + 1}: {question['question']}",
+                        'Type': question['type'],
+                        'Difficulty (p)': round(float(analysis.p_values[i]), 2),
+                        'Discrimination': round(float(analysis.discrimination[i]), 2),
+                        'Answers chosen': ", ".join(f"{option}: {count}"
+                                                    for option, count in distractors.items())
+                        if distractors else "",
+                    })
+                st.dataframe(rows)
             else:
-                st.info("No evaluated submissions available")
+                st.info("No graded submissions for this test yet")
+        
+        # Semester report from the columnar snapshot
+        st.subheader("Semester Report")
+        analytics_exporter.start()
+        if st.button("Refresh Snapshot"):
+            try:
+                analytics_exporter.export()
+            except Exception as e:
+                st.error(f"Snapshot failed: {str(e)}")
+        if analytics_exporter.last_export:
+            st.caption("Snapshot taken " + datetime.fromtimestamp(analytics_exporter.last_export)
+                       .strftime("%Y-%m-%d %H:%M:%S"))
+        if analytics_exporter.last_error:
+            failed_at, error = analytics_exporter.last_error
+            st.warning("Last automatic snapshot failed at "
+                       + datetime.fromtimestamp(failed_at).strftime("%Y-%m-%d %H:%M:%S")
+                       + f": {str(error)}")
+        monthly = monthly_report()
+        if monthly.empty:
+            st.info("No analytics snapshot yet")
         else:
-            st.info("No data available for statistics")
+            st.dataframe(monthly)
+            st.dataframe(test_report())
 
 if __name__ == "__main__":
     professor_dashboard()
\ No newline at end of file
@@ -1,13 +1,17 @@
 import cv2
 import numpy as np
-import mediapipe as mp
 from datetime import datetime, timedelta
 from collections import deque
 from enum import Enum
+from operator import attrgetter
 import streamlit as st
 import time
 import logging
 import os
+from lms.config import DETECTOR_BACKEND, DETECTOR_CPU_BUDGET, DETECTOR_MAX_FRAME_SKIP, FRAME_SOURCE
+from lms.face_landmarks import create_backend
+from lms.frame_pipeline import FramePipeline, FrameSkipController
+from lms.frame_sources import open_source
 
 # Suppress MediaPipe logging
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
@@ -22,22 +26,44 @@ class ConcentrationLevel(Enum):
     MODERATE = "Moderate"
     LOW = "Low"
 
+# Face-mesh landmarks read by the analysis methods; extract_landmarks gathers
+# them into one array per frame, with rows in this order
+NOSE = 1
+EAR_POINTS = [234, 454]
+LEFT_EYE = [33, 160, 158, 133, 153, 144]
+RIGHT_EYE = [362, 385, 387, 263, 373, 380]
+EYEBROWS = [65, 295]
+MOUTH_CORNERS = [61, 291]
+FEATURE_LANDMARKS = [NOSE] + EAR_POINTS + LEFT_EYE + RIGHT_EYE + EYEBROWS + MOUTH_CORNERS
+
+NOSE_ROW = 0
+EAR_ROWS = slice(1, 3)
+EYE_ROWS = slice(3, 15)
+EYEBROW_ROWS = slice(15, 17)
+MOUTH_ROWS = slice(17, 19)
+
+_xyz = attrgetter('x', 'y', 'z')
+
+def extract_landmarks(face_landmarks):
+    """(len(FEATURE_LANDMARKS), 3) array of x, y, z, or None without a face"""
+    if not face_landmarks:
+        return None
+    landmarks = face_landmarks.landmark
+    return np.array([_xyz(landmarks[i]) for i in FEATURE_LANDMARKS])
+
 class ConcentrationDetector:
-    def __init__(self, duration_minutes=None):
-        # Initialize MediaPipe with optimized settings
-        self.mp_holistic = mp.solutions.holistic
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.holistic = self.mp_holistic.Holistic(
-            min_detection_confidence=0.3,  # Lowered for better performance
-            min_tracking_confidence=0.3,
-            model_complexity=0  # Use fastest model
-        )
+    def __init__(self, duration_minutes=None, backend=None):
+        # Face landmark model; a name from lms.face_landmarks.BACKENDS or a backend object
+        backend = backend or DETECTOR_BACKEND
+        self.landmarks = create_backend(backend) if isinstance(backend, str) else backend
         
         # Initialize other attributes
         self.duration_minutes = duration_minutes
         self.start_time = None
         self.is_running = True
-        self.frame_skip = 2  # Process every nth frame
+        # Process every nth frame, with n adapted to keep inference within budget
+        self.skip_controller = FrameSkipController(DETECTOR_CPU_BUDGET,
+                                                   max_skip=DETECTOR_MAX_FRAME_SKIP)
         self.frame_count = 0
         self.initialize_tracking_variables()
         
@@ -56,19 +82,17 @@ class ConcentrationDetector:
         self.calibration_frames = 30  # Reduced calibration frames
         self.calibration_data = []
         self.last_processed_result = None
+        self.last_processed_at = None
 
     def calibrate(self, frame):
         """Calibrate baseline face position for the user"""
         frame_small = cv2.resize(frame, (0, 0), fx=0.5, fy=0.5)
-        results = self.holistic.process(cv2.cvtColor(frame_small, cv2.COLOR_BGR2RGB))
+        face_landmarks = self.landmarks.process(cv2.cvtColor(frame_small, cv2.COLOR_BGR2RGB))
         
-        if results.face_landmarks:
+        points = extract_landmarks(face_landmarks)
+        if points is not None:
             # Scale landmarks back to original frame size
-            nose_pos = np.array([
-                results.face_landmarks.landmark[1].x * 2,
-                results.face_landmarks.landmark[1].y * 2,
-                results.face_landmarks.landmark[1].z
-            ])
+            nose_pos = points[NOSE_ROW] * [2, 2, 1]
             self.calibration_data.append(nose_pos)
             
             if len(self.calibration_data) == self.calibration_frames:
@@ -76,15 +100,13 @@ class ConcentrationDetector:
                 return True
         return False
 
-    def detect_working_status(self, results):
-        """Optimized working status detection"""
-        if not results.face_landmarks:
+    def detect_working_status(self, points):
+        """Optimized working status detection from extract_landmarks output"""
+        if points is None:
             return WorkingStatus.NOT_WORKING
 
-        nose = results.face_landmarks.landmark[1]
-        left_ear = results.face_landmarks.landmark[234]
-        right_ear = results.face_landmarks.landmark[454]
-        ear_distance = abs(left_ear.x - right_ear.x)
+        left_ear, right_ear = points[EAR_ROWS, 0]
+        ear_distance = abs(left_ear - right_ear)
         
         # More lenient threshold for head rotation
         if ear_distance < 0.1:
@@ -92,14 +114,14 @@ class ConcentrationDetector:
 
         return WorkingStatus.WORKING
 
-    def analyze_concentration(self, results):
+    def analyze_concentration(self, points):
         """Optimized concentration analysis with adjusted thresholds"""
-        if not results.face_landmarks:
+        if points is None:
             return ConcentrationLevel.LOW
 
         # Calculate weighted scores
-        position_score = self.analyze_face_position(results.face_landmarks) * 0.35
-        face_score = self.analyze_face(results.face_landmarks) * 0.35
+        position_score = self.analyze_face_position(points) * 0.35
+        face_score = self.analyze_face(points) * 0.35
         stability_score = self.analyze_stability() * 0.3
 
         total_score = position_score + face_score + stability_score
@@ -118,16 +140,12 @@ class ConcentrationDetector:
             self.current_concentration_start = None
             return ConcentrationLevel.LOW
 
-    def analyze_face_position(self, face_landmarks):
+    def analyze_face_position(self, points):
         """Analyze face position relative to baseline"""
         if self.baseline_face_position is None:
             return 0.5
 
-        current_nose_pos = np.array([
-            face_landmarks.landmark[1].x,
-            face_landmarks.landmark[1].y,
-            face_landmarks.landmark[1].z
-        ])
+        current_nose_pos = points[NOSE_ROW]
 
         deviation = np.linalg.norm(current_nose_pos - self.baseline_face_position)
         position_score = max(0, 1 - (deviation * 3))
@@ -135,32 +153,26 @@ class ConcentrationDetector:
         self.face_position_history.append(position_score)
         return np.mean(self.face_position_history)
 
-    def analyze_face(self, face_landmarks):
+    def analyze_face(self, points):
         """Analyze facial features and eye state"""
-        # Calculate eye aspect ratio
-        left_eye = [face_landmarks.landmark[i] for i in [33, 160, 158, 133, 153, 144]]
-        right_eye = [face_landmarks.landmark[i] for i in [362, 385, 387, 263, 373, 380]]
-        
-        left_ear = self.calculate_ear(left_eye)
-        right_ear = self.calculate_ear(right_eye)
+        # Calculate eye aspect ratio for both eyes at once
+        left_ear, right_ear = self.calculate_ear(points[EYE_ROWS, :2].reshape(2, 6, 2))
         avg_ear = (left_ear + right_ear) / 2
         
         self.blink_history.append(avg_ear < 0.2)
         blink_rate = sum(self.blink_history) * (60 / len(self.blink_history))
         blink_score = max(0, 1 - abs(blink_rate - 17.5) / 25)
         
-        expression_score = self.analyze_expression(face_landmarks)
+        expression_score = self.analyze_expression(points)
         
         return (blink_score * 0.4 + expression_score * 0.6)
 
-    def analyze_expression(self, face_landmarks):
+    def analyze_expression(self, points):
         """Analyze facial expression with optimized thresholds"""
-        left_eyebrow = face_landmarks.landmark[65].y
-        right_eyebrow = face_landmarks.landmark[295].y
+        left_eyebrow, right_eyebrow = points[EYEBROW_ROWS, 1]
         
-        mouth_left = face_landmarks.landmark[61]
-        mouth_right = face_landmarks.landmark[291]
-        mouth_width = abs(mouth_right.x - mouth_left.x)
+        mouth_left, mouth_right = points[MOUTH_ROWS, 0]
+        mouth_width = abs(mouth_right - mouth_left)
         
         eyebrow_score = max(0, 1 - abs(0.35 - (left_eyebrow + right_eyebrow) / 2) * 2)
         mouth_score = max(0, 1 - abs(0.4 - mouth_width) * 1.5)
@@ -180,15 +192,12 @@ class ConcentrationDetector:
                           (len(self.status_history) - 1))
         return stability
 
-    def calculate_ear(self, eye):
-        """Calculate eye aspect ratio"""
-        vertical_dist1 = np.linalg.norm(np.array([eye[1].x, eye[1].y]) - 
-                                      np.array([eye[5].x, eye[5].y]))
-        vertical_dist2 = np.linalg.norm(np.array([eye[2].x, eye[2].y]) - 
-                                      np.array([eye[4].x, eye[4].y]))
-        horizontal_dist = np.linalg.norm(np.array([eye[0].x, eye[0].y]) - 
-                                       np.array([eye[3].x, eye[3].y]))
-        return (vertical_dist1 + vertical_dist2) / (2 * horizontal_dist)
+    def calculate_ear(self, eyes):
+        """Calculate eye aspect ratio for each eye in an (n, 6, 2) array of x, y"""
+        # Two vertical and one horizontal distance per eye, in one batch
+        deltas = eyes[:, [1, 2, 0]] - eyes[:, [5, 4, 3]]
+        distances = np.sqrt(np.einsum('ijk,ijk->ij', deltas, deltas))
+        return (distances[:, 0] + distances[:, 1]) / (2 * distances[:, 2])
 
     def display_status(self, frame, status, concentration):
         """Display status on frame with optimized visuals"""
@@ -218,14 +227,10 @@ class ConcentrationDetector:
     def calibrate(self, frame):
         """Simple calibration method"""
         try:
-            results = self.holistic.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-            if results.face_landmarks:
-                nose_pos = np.array([
-                    results.face_landmarks.landmark[1].x,
-                    results.face_landmarks.landmark[1].y,
-                    results.face_landmarks.landmark[1].z
-                ])
-                self.calibration_data.append(nose_pos)
+            face_landmarks = self.landmarks.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            points = extract_landmarks(face_landmarks)
+            if points is not None:
+                self.calibration_data.append(points[NOSE_ROW])
                 if len(self.calibration_data) == self.calibration_frames:
                     self.baseline_face_position = np.mean(self.calibration_data, axis=0)
                     return True
@@ -234,36 +239,51 @@ class ConcentrationDetector:
             st.error(f"Calibration error: {str(e)}")
             return False
 
-    def process_frame(self, frame):
-        """Optimized frame processing"""
+    @property
+    def frame_skip(self):
+        return self.skip_controller.skip
+
+    def process_frame(self, frame, timestamp=None):
+        """Optimized frame processing
+
+        timestamp is when the frame was captured, in time.perf_counter
+        seconds (now by default). Time since the previous processed frame is
+        credited to the status seen on this one, so the report follows the
+        wall clock whatever the camera rate and skip rate.
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
         self.frame_count += 1
         
         # Skip frames for better performance
-        if self.frame_count % self.frame_skip != 0:
+        if not self.skip_controller.offer(timestamp):
             if self.last_processed_result:
                 return self.last_processed_result
             return frame, WorkingStatus.NOT_WORKING, ConcentrationLevel.LOW
 
         # Resize frame for better performance
+        inference_start = time.perf_counter()
         frame_small = cv2.resize(frame, (0, 0), fx=0.5, fy=0.5)
-        results = self.holistic.process(cv2.cvtColor(frame_small, cv2.COLOR_BGR2RGB))
-        
-        status = self.detect_working_status(results)
-        concentration = self.analyze_concentration(results)
+        face_landmarks = self.landmarks.process(cv2.cvtColor(frame_small, cv2.COLOR_BGR2RGB))
         
-        self.status_durations[status] += self.frame_skip/30
-        self.concentration_durations[concentration] += self.frame_skip/30
+        points = extract_landmarks(face_landmarks)
+        status = self.detect_working_status(points)
+        concentration = self.analyze_concentration(points)
+        self.skip_controller.record_inference(time.perf_counter() - inference_start)
         
-        # Scale landmarks back to original frame size
-        if results.face_landmarks:
-            for landmark in results.face_landmarks.landmark:
-                landmark.x *= 2
-                landmark.y *= 2
+        elapsed = timestamp - self.last_processed_at if self.last_processed_at is not None else 0
+        self.last_processed_at = timestamp
+        self.status_durations[status] += elapsed
+        self.concentration_durations[concentration] += elapsed
         
         self.display_status(frame, status, concentration)
         self.last_processed_result = (frame, status, concentration)
         return frame, status, concentration
 
+    def close(self):
+        """Release the landmark model"""
+        self.landmarks.close()
+
     def get_report(self):
         """Generate session report"""
         total_time = sum(self.concentration_durations.values())
@@ -282,18 +302,22 @@ class ConcentrationDetector:
                     'percentage': (self.status_durations[status] / total_time * 100)
                     if total_time > 0 else 0
                 } for status in WorkingStatus
-            }
+            },
+            'processing': self.skip_controller.stats()
         }
 
-    def process_video_feed(self):
-        """Optimized video feed processing"""
+    def process_video_feed(self, source=None):
+        """Optimized video feed processing
+
+        source is any lms.frame_sources source and is released when the
+        session ends; by default LMS_FRAME_SOURCE (the webcam) is opened.
+        """
         cap = None
+        pipeline = None
         try:
-            cap = cv2.VideoCapture(0)
-            cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)  # Reduced resolution
-            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+            cap = source or open_source(FRAME_SOURCE)
             
-            if not cap.isOpened():
+            if not cap.is_opened():
                 st.error("Failed to open camera feed")
                 return None
 
@@ -303,6 +327,7 @@ class ConcentrationDetector:
                 frame_placeholder = st.empty()
                 status_placeholder = st.empty()
                 progress_placeholder = st.empty()
+                pipeline_placeholder = st.empty()
             
             with col2:
                 session_timer = st.empty()
@@ -323,16 +348,26 @@ class ConcentrationDetector:
 
             st.success("Calibration complete!")
 
+            # Capture and inference run on their own threads; this loop only renders
+            pipeline = FramePipeline(cap.read, self.process_frame).start()
             while not stop_button:
-                ret, frame = cap.read()
-                if not ret:
-                    break
+                result = pipeline.next_result(timeout=1.0)
+                if result is None:
+                    if pipeline.finished:
+                        break
+                    continue
 
-                processed_frame, status, concentration = self.process_frame(frame)
+                _, (processed_frame, status, concentration) = result
                 rgb_frame = cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB)
                 
                 frame_placeholder.image(rgb_frame, use_container_width=True)
                 status_placeholder.text(f"Status: {status.value} | Concentration: {concentration.value}")
+                stats = pipeline.stats()
+                pipeline_placeholder.caption(
+                    f"Queues: capture {stats['capture_queue']}, render {stats['render_queue']} | "
+                    f"Dropped: {stats['dropped_before_inference']} stale frames | "
+                    f"Inference: {stats['inference_ms']:.0f} ms | Latency: {stats['latency_ms']:.0f} ms | "
+                    f"Processing 1 in {self.frame_skip} frames")
                 
                 elapsed_time = datetime.now() - self.start_time
                 if self.duration_minutes:
@@ -346,11 +381,16 @@ class ConcentrationDetector:
                 if end_time and datetime.now() >= end_time:
                     break
 
-                time.sleep(0.01)
+            # A capture or inference failure ends the pipeline early; don't
+            # report the partial session as if it were complete
+            if pipeline.error is not None:
+                raise pipeline.error
 
             return self.get_report()
             
         finally:
-            if cap and cap.isOpened():
+            if pipeline:
+                pipeline.stop()
+            if cap:
                 cap.release()
             cv2.destroyAllWindows()
\ No newline at end of file
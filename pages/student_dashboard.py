@@ -1,10 +1,12 @@
 import streamlit as st
-import json
-from datetime import datetime
+import base64
 import os
 import sys
 from pathlib import Path
 from pages.selfstudy import ConcentrationDetector
+from lms.blobs import blob_store
+from lms.repository import get_repository
+from lms.study_sessions import study_sessions
 
 # Add parent directory to path to allow imports from sibling directories
 sys.path.append(str(Path(__file__).parent.parent))
@@ -13,33 +15,9 @@ sys.path.append(str(Path(__file__).parent.parent))
 if 'logged_in' not in st.session_state or not st.session_state.logged_in:
     st.switch_page("app.py")
 
-def load_content(content_type):
-    try:
-        file_path = Path(__file__).parent.parent / f'{content_type}.json'
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
-
 def save_study_session(username, report):
-    """Save study session report to JSON file"""
-    file_path = Path(__file__).parent.parent / 'study_sessions.json'
-    try:
-        with open(file_path, 'r') as f:
-            sessions = json.load(f)
-    except FileNotFoundError:
-        sessions = {}
-    
-    if username not in sessions:
-        sessions[username] = []
-    
-    sessions[username].append({
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'report': report
-    })
-    
-    with open(file_path, 'w') as f:
-        json.dump(sessions, f)
+    """Append the study session report to the student's own session file"""
+    study_sessions.append(username, report)
 
 def handle_study_session(duration):
     """Handle the study session and return the report"""
@@ -58,31 +36,29 @@ def handle_study_session(duration):
 
 def display_study_history():
     """Display previous study sessions"""
-    file_path = Path(__file__).parent.parent / 'study_sessions.json'
-    try:
-        with open(file_path, 'r') as f:
-            sessions = json.load(f)
-            user_sessions = sessions.get(st.session_state.username, [])
-            
-            if user_sessions:
-                for session in reversed(user_sessions):
-                    with st.expander(f"Study Session - {session['timestamp']}"):
-                        report = session['report']
-                        st.write(f"Total Study Time: {report['total_time']:.2f} seconds")
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.subheader("Concentration Levels")
-                            for level, data in report['concentration_levels'].items():
-                                st.write(f"{level}: {data['time']:.2f}s ({data['percentage']:.1f}%)")
-                        
-                        with col2:
-                            st.subheader("Working Status")
-                            for status, data in report['working_status'].items():
-                                st.write(f"{status}: {data['time']:.2f}s ({data['percentage']:.1f}%)")
-            else:
-                st.info("No study sessions recorded yet")
-    except FileNotFoundError:
+    user_sessions = study_sessions.load(st.session_state.username)
+    
+    if user_sessions:
+        for session in reversed(user_sessions):
+            with st.expander(f"Study Session - {session['timestamp']}"):
+                report = session['report']
+                st.write(f"Total Study Time: {report['total_time']:.2f} seconds")
+                if 'processing' in report:
+                    processing = report['processing']
+                    st.caption(f"Analyzed 1 in {processing['average_frame_skip']:.1f} frames "
+                               f"({processing['inference_ms']:.0f} ms per frame)")
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.subheader("Concentration Levels")
+                    for level, data in report['concentration_levels'].items():
+                        st.write(f"{level}: {data['time']:.2f}s ({data['percentage']:.1f}%)")
+                
+                with col2:
+                    st.subheader("Working Status")
+                    for status, data in report['working_status'].items():
+                        st.write(f"{status}: {data['time']:.2f}s ({data['percentage']:.1f}%)")
+    else:
         st.info("No study sessions recorded yet")
 
 def student_dashboard():
@@ -113,7 +89,7 @@ def student_dashboard():
         
         with col1:
             st.subheader("Recent Tests")
-            tests = load_content('tests')
+            tests = get_repository().list_test_catalog()
             if tests:
                 for test in tests:
                     if st.button(f"Take {test['name']}", key=test['name']):
@@ -123,7 +99,7 @@ def student_dashboard():
         
         with col2:
             st.subheader("Study Materials")
-            notes = load_content('notes')
+            notes = get_repository().list_notes()
             if notes:
                 for note in notes:
                     st.write(f"📚 {note['title']}")
@@ -167,34 +143,45 @@ def student_dashboard():
     
     elif selection == "View Notes":
         st.header("Study Materials")
-        notes = load_content('notes')
+        notes = get_repository().list_notes()
         if notes:
             for note in notes:
                 with st.expander(note['title']):
                     st.write(note['content'])
-                    st.download_button(
-                        "Download PDF",
-                        note['file'],
-                        file_name=f"{note['title']}.pdf"
-                    )
+                    if note.get('file_ref'):
+                        with blob_store.open(note['file_ref']) as pdf:
+                            st.download_button(
+                                "Download PDF",
+                                pdf,
+                                file_name=f"{note['title']}.pdf",
+                                mime="application/pdf"
+                            )
+                    elif note.get('file'):
+                        # Notes uploaded before the blob store embed the PDF as base64
+                        st.download_button(
+                            "Download PDF",
+                            base64.b64decode(note['file']),
+                            file_name=f"{note['title']}.pdf",
+                            mime="application/pdf"
+                        )
         else:
             st.info("No study materials available")
     
     elif selection == "My Submissions":
         st.header("Your Submissions")
-        submissions = load_content('submissions')
-        if submissions:
-            for sub in submissions:
-                st.write(f"Test: {sub['test_name']}")
-                st.write(f"Score: {sub['score']}")
-                st.write(f"Submitted: {sub['date']}")
-                st.divider()
-        else:
+        has_submissions = False
+        for sub in get_repository().iter_submissions(student=st.session_state.username):
+            has_submissions = True
+            st.write(f"Test: {sub['test_name']}")
+            st.write(f"Score: {sub.get('score', 'Pending evaluation')}")
+            st.write(f"Submitted: {sub['date']}")
+            st.divider()
+        if not has_submissions:
             st.info("No submissions yet")
     
     elif selection == "View Grades":
         st.header("Your Grades")
-        grades = load_content('grades')
+        grades = get_repository().list_grades()
         if grades:
             for grade in grades:
                 st.metric(grade['subject'], f"{grade['score']}%")
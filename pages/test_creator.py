@@ -1,18 +1,9 @@
 import streamlit as st
-import json
 from datetime import datetime
 import uuid
-
-def load_content(content_type):
-    try:
-        with open(f'{content_type}.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
-
-def save_content(content_type, data):
-    with open(f'{content_type}.json', 'w') as f:
-        json.dump(data, f)
+from lms.bulk import QUESTION_COLUMNS, import_upload
+from lms.parsed_tests import validate_test
+from lms.repository import get_repository
 
 def test_creator():
     if 'logged_in' not in st.session_state or not st.session_state.logged_in:
@@ -20,6 +11,23 @@ def test_creator():
 
     st.title("Create New Test")
 
+    # Bulk import of question banks authored offline
+    with st.expander("Import Tests from CSV/JSONL"):
+        st.caption("One question per row with columns: " + ", ".join(QUESTION_COLUMNS)
+                   + ". Keep each test's rows together and separate options with '|'.")
+        upload = st.file_uploader("Question bank", type=['csv', 'jsonl'], key="bulk_import")
+        if upload and st.button("Import"):
+            try:
+                result = import_upload(upload, st.session_state.username)
+            except (ValueError, UnicodeDecodeError) as e:
+                st.error(f"Import stopped: {str(e)}")
+            else:
+                st.success(f"Imported {result.imported} tests ({result.questions} questions)")
+                if result.rejected:
+                    st.warning(f"Skipped {result.rejected} invalid tests")
+                    for line_number, name, problems in result.errors:
+                        st.write(f"Line {line_number} ({name}): {'; '.join(problems)}")
+
     # Test basic information
     test_name = st.text_input("Test Name")
     subject = st.text_input("Subject")
@@ -118,9 +126,13 @@ def test_creator():
             "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         
-        tests = load_content('tests')
-        tests.append(test_data)
-        save_content('tests', tests)
+        # The exam page refuses tests that fail validation, so never save one
+        problems = validate_test(test_data)
+        if problems:
+            st.error("Please fix the test before saving: " + "; ".join(problems))
+            return
+        
+        get_repository().add_test(test_data)
         
         st.success("Test created successfully!")
         st.session_state.questions = []  # Clear questions after saving
@@ -1,9 +1,13 @@
 import streamlit as st
-import json
 from datetime import datetime
 from pages.selfstudy import ConcentrationDetector, ConcentrationLevel
 import threading
 import time
+import uuid
+from lms.checkpoints import checkpoints
+from lms.grading_service import grading_service
+from lms.parsed_tests import InvalidTestError, parsed_tests
+from lms.repository import get_repository
 
 class TestMonitor:
     def __init__(self, test_duration):
@@ -27,7 +31,7 @@ class TestMonitor:
             self.is_monitoring = False
             if self.monitoring_thread and self.monitoring_thread.is_alive():
                 self.monitoring_thread.join(timeout=5)  # Wait up to 5 seconds for thread to finish
-            self.concentration_detector.holistic.close()  # Close MediaPipe resources
+            self.concentration_detector.close()  # Close MediaPipe resources
         
     def _monitor_concentration(self):
         """Background thread for monitoring concentration"""
@@ -59,26 +63,29 @@ class TestMonitor:
         return None
 
 def load_test(test_id):
-    try:
-        with open('tests.json', 'r') as f:
-            tests = json.load(f)
-            for test in tests:
-                if test['id'] == test_id:
-                    return test
-        return None
-    except FileNotFoundError:
-        return None
+    """Return the shared read-only copy of the test"""
+    return parsed_tests.get(test_id)
 
 def save_submission(submission):
-    try:
-        with open('submissions.json', 'r') as f:
-            submissions = json.load(f)
-    except FileNotFoundError:
-        submissions = []
-        
-    submissions.append(submission)
-    with open('submissions.json', 'w') as f:
-        json.dump(submissions, f)
+    """Store the submission and queue it for background grading"""
+    get_repository().add_submission(submission)
+    grading_service.enqueue(submission)
+
+def checkpoint_answer(question_key):
+    """Widget callback: queue the changed answer for the attempt's checkpoint"""
+    checkpoints.record(st.session_state.username, st.session_state.current_test,
+                       {question_key: st.session_state[question_key]})
+
+def restore_answers(test):
+    """Replay the attempt's checkpoint into the answer widgets; returns the answers"""
+    saved = checkpoints.load(st.session_state.username, test['id'])
+    for i, question in enumerate(test['questions']):
+        key = f"q_{i}"
+        if key not in saved or key in st.session_state:
+            continue
+        if question['type'] == 'Short Answer' or saved[key] in question['options']:
+            st.session_state[key] = saved[key]
+    return saved
 
 def cleanup_monitoring():
     """Helper function to clean up monitoring resources"""
@@ -95,33 +102,29 @@ def test_interface():
     
     if 'current_test' not in st.session_state:
         # Show available tests
-        try:
-            with open('tests.json', 'r') as f:
-                tests = json.load(f)
-                if not tests:
-                    st.warning("No tests available")
-                    return
-                    
-                test_options = [f"{test['name']} - {test['subject']}" for test in tests]
-                selected_index = st.selectbox("Select Test", range(len(test_options)), 
-                                           format_func=lambda x: test_options[x])
-                
-                if st.button("Start Test"):
-                    st.session_state.current_test = tests[selected_index]['id']
-                    # Initialize concentration monitoring
-                    test_duration = tests[selected_index]['duration']
-                    st.session_state.test_monitor = TestMonitor(test_duration)
-                    st.rerun()
-                    
-        except FileNotFoundError:
-            st.error("No tests available")
-            return
-        except json.JSONDecodeError:
-            st.error("Invalid test data format")
+        tests = get_repository().list_test_catalog()
+        if not tests:
+            st.warning("No tests available")
             return
+            
+        test_options = [f"{test['name']} - {test['subject']}" for test in tests]
+        selected_index = st.selectbox("Select Test", range(len(test_options)), 
+                                   format_func=lambda x: test_options[x])
+        
+        if st.button("Start Test"):
+            st.session_state.current_test = tests[selected_index]['id']
+            # Initialize concentration monitoring
+            test_duration = tests[selected_index]['duration']
+            st.session_state.test_monitor = TestMonitor(test_duration)
+            st.rerun()
     else:
         # Show current test
-        test = load_test(st.session_state.current_test)
+        try:
+            test = load_test(st.session_state.current_test)
+        except InvalidTestError as e:
+            st.error(str(e))
+            cleanup_monitoring()
+            return
         if not test:
             st.error("Test not found")
             cleanup_monitoring()
@@ -138,6 +141,10 @@ def test_interface():
         # Initialize answers in session state
         if 'answers' not in st.session_state:
             st.session_state.answers = {}
+            # Resume an attempt interrupted by a closed tab or restarted server
+            restored = restore_answers(test)
+            if restored:
+                st.info(f"Restored {len(restored)} saved answers from your last session")
         
         # Display questions
         for i, question in enumerate(test['questions']):
@@ -146,12 +153,15 @@ def test_interface():
             st.write(f"Type: {question['type']}")
             
             if question['type'] == 'Short Answer':
-                answer = st.text_area("Your answer:", key=f"q_{i}")
+                answer = st.text_area("Your answer:", key=f"q_{i}",
+                                      on_change=checkpoint_answer, args=(f"q_{i}",))
             else:  # Multiple Choice or True/False
                 answer = st.radio(
                     "Select your answer:",
                     question['options'],
-                    key=f"q_{i}"
+                    key=f"q_{i}",
+                    on_change=checkpoint_answer,
+                    args=(f"q_{i}",)
                 )
             st.session_state.answers[f"q_{i}"] = answer
         
@@ -171,11 +181,12 @@ def test_interface():
                 'test_name': test['name'],
                 'answers': st.session_state.answers,
                 'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'id': f"sub_{datetime.now().strftime('%Y%m%d%H%M%S')}",
+                'id': f"sub_{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}",
                 'concentration_warning': warning if warning else None
             }
             
             save_submission(submission)
+            checkpoints.discard(st.session_state.username, st.session_state.current_test)
             
             if warning:
                 st.warning(warning['message'])
@@ -0,0 +1,43 @@
+from lms.feed import page_after, post_cursor
+
+
+def make_posts(count, start=0):
+    """Newest-first posts with one-minute timestamps"""
+    return [{'id': f'post{n:03d}', 'timestamp': f'2025-01-01 10:{n:02d}:00'}
+            for n in reversed(range(start, start + count))]
+
+
+def read_all(posts, page_size):
+    seen, cursor = [], None
+    while True:
+        page, cursor = page_after(posts, cursor, page_size)
+        seen.extend(post['id'] for _, post in page)
+        if cursor is None:
+            return seen
+
+
+def test_pages_cover_every_post_once():
+    posts = make_posts(45)
+    assert read_all(posts, 20) == [post['id'] for post in posts]
+
+
+def test_old_shared_post_at_top_does_not_restart_paging():
+    shared = {'id': 'club_post', 'timestamp': '2024-06-01 09:00:00'}
+    posts = [shared] + make_posts(25, start=10)
+    assert read_all(posts, 10) == [post['id'] for post in posts]
+
+
+def test_same_second_posts_page_by_id():
+    posts = [{'id': post_id, 'timestamp': '2025-01-01 10:00:00'}
+             for post_id in ('f3a', '0bc', 'e91', '27d')]
+    assert read_all(posts, 1) == ['f3a', '0bc', 'e91', '27d']
+
+
+def test_deleted_cursor_post_resumes_after_it():
+    shared = {'id': 'club_post', 'timestamp': '2024-06-01 09:00:00'}
+    posts = [shared] + make_posts(25, start=10)
+    page, cursor = page_after(posts, None, 10)
+    del posts[9]
+    page, _ = page_after(posts, cursor, 10)
+    assert page[0][1] is posts[9]
+    assert post_cursor(page[0][1]) < cursor